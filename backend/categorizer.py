@@ -5,15 +5,119 @@ ENHANCED for healthcare marketing agency sites
 """
 import re
 import json
+import hashlib
+import asyncio
 import logging
-from typing import Dict, List, Optional
+import time
+import functools
+from typing import Dict, Iterable, List, Optional, Tuple
 from collections import defaultdict
-import tiktoken
-from openai import OpenAI
+from concurrent.futures import ProcessPoolExecutor
+from urllib.parse import urlsplit
+import ahocorasick
+from openai import AsyncOpenAI, OpenAI
 import os
 
+from .json_cache import JSONCache
+
+try:
+    # Optional faster JSON parser for GPT responses
+    import orjson
+except ImportError:
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
+# Trailing commas GPT sometimes leaves before a closing bracket or brace
+_TRAILING_COMMA_RE = re.compile(r',\s*([\]}])')
+
+# Truncation marks Screaming Frog leaves in meta descriptions, plus stray ellipses
+_TRUNCATION_RE = re.compile(r'\[(?:…|\.\.\.)\]|…')
+
+
+# Scheme and host at the start of a URL
+_DOMAIN_RE = re.compile(r'^https?://[^/]+')
+
+# Maps the other URL segment separators onto '/' so one split covers all three
+_SEGMENT_SEPARATORS = str.maketrans('-_', '//')
+
+# Priority indicators checked by pattern_based_categorize, in priority order
+_BEFORE_AFTER_INDICATORS = (
+    'before-and-after', 'before & after', 'before and after',
+    'transformation', 'results', 'gallery', 'high-definition',
+    'before-after'
+)
+
+# Specific healthcare blog indicators (title or meta)
+_HEALTHCARE_BLOG_INDICATORS = (
+    'new surgical center opens',
+    'opens flagship',
+    'featured in forbes',
+    'announcement',
+    'press release',
+    'news:',
+    'study finds',
+    'research shows',
+    'breakthrough',
+    'collaboration',
+    'partnership',
+    'prma celebrates',
+    'prma performs',
+    'prma reaches'
+)
+
+_TESTIMONIAL_INDICATORS = ('testimonial', 'testimonials', 'story', 'stories', 'experience', 'success-story')
+
+_BLOG_URL_PATTERNS = (
+    '/blog/',                    # Standard: /blog/post-title
+    '-blog/',                    # Healthcare: /surgery-blog/post-title, /plastic-surgery-blog/
+    '/blog-',                    # Alternative: /blog-category/post
+    'blog/',                     # Edge case: domain.com/blog/post
+    '/news/',                    # News sections
+    '/articles/',                # Article sections
+    '/insights/',                # Insights/thought leadership
+)
+
+# URL structure rules, checked in order - the first matching path wins
+_URL_STRUCTURE_CATEGORIES = (
+    ("Patient Resources", ('/patient-information/', '/patient-resources/', '/testimonials/', '/testimonial/')),
+    ("Locations", ('/locations/',)),
+    ("Providers", ('/physicians/', '/providers/', '/breast-reconstruction-surgeons/')),
+    ("Services", ('/services/', '/cosmetic-surgery/')),
+)
+
+
+def _json_loads(data: str):
+    """Parse JSON with orjson when installed, else (or if it refuses) with json"""
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass  # json also accepts e.g. NaN
+    return json.loads(data)
+
+
+# Page fields pattern categorization reads - all a worker process needs
+_CATEGORIZE_FIELDS = ('Address', 'Title 1', 'Meta Description 1', 'H1-1')
+
+# Per-process categorizer, set up by _init_categorize_worker
+_worker_categorizer = None
+
+
+def _init_categorize_worker(patterns: Dict[str, List[str]]):
+    """Build a pattern-only Categorizer in a worker process (no API client)"""
+    global _worker_categorizer
+    categorizer = object.__new__(Categorizer)
+    categorizer.patterns = patterns
+    categorizer._compile_patterns()
+    _worker_categorizer = categorizer
+
+
+def _categorize_chunk(pages: List[Dict]) -> List[Tuple[str, Dict]]:
+    """Categorize a chunk of pages in a worker process"""
+    return [_worker_categorizer._categorize_one(page) for page in pages]
+
+
 class Categorizer:
     """Categorize pages using patterns or GPT - Enhanced for Healthcare"""
     
@@ -74,10 +178,127 @@ class Categorizer:
         ]
     }
     
-    def __init__(self, use_gpt: bool = True, api_key: Optional[str] = None):
+    # Section order of categorized results; unlisted categories sort at 50
+    CATEGORY_PRIORITY = {
+        "About": 1,
+        "Services": 2, 
+        "Before & After": 3,
+        "Providers": 4,
+        "Locations": 5,
+        "Patient Resources": 6,
+        "Blog": 7,
+        "Areas Treated": 8,
+        "Other": 99
+    }
+    
+    # Maximum number of GPT enhancement batches in flight at once
+    ENHANCEMENT_CONCURRENCY = 8
+    
+    # Sites with at least this many pages are categorized across processes
+    PARALLEL_CATEGORIZE_MIN_PAGES = 10000
+    PARALLEL_CATEGORIZE_CHUNK_SIZE = 1000
+    
+    # Seconds between status checks on a Batch API enhancement job
+    BATCH_POLL_INTERVAL = 30
+    
+    # Where enhanced titles/descriptions are kept between runs
+    ENHANCEMENT_CACHE_PATH = os.path.join('.llms_cache', 'enhancements.sqlite')
+    
+    # Enhancement prompt openings by section, formatted once per run with
+    # site_title and section; DEFAULT_ENHANCEMENT_PROMPT covers the rest.
+    # Site and section come last so every batch shares the longest possible
+    # identical prefix (with the fixed system message) for OpenAI's prompt cache
+    ENHANCEMENT_PROMPTS = {
+        'Blog': """You are optimizing blog content specifically for LLMS.txt files to help AI search engines understand and recommend articles.
+
+For each blog post below, write LLMS.txt optimized entries.
+
+TITLE requirements:
+- Keep the existing title if it's already clear and specific
+- Only modify if it contains site branding or is too vague
+- Ensure it describes what the article is about
+
+DESCRIPTION requirements - Answer: "What will readers learn from this?"
+- 15-25 words focusing on key takeaways and insights
+- Use conversational language: "Explains how..." "Shows why..." "Reveals what..."
+- Include specific benefits or knowledge gained
+- NO SEO phrases like "Learn about" or "Discover"
+
+Example:
+BAD: "Learn about our latest breast reconstruction techniques and innovations."
+GOOD: "New microsurgical techniques reduce recovery time and improve natural tissue reconstruction outcomes."
+
+Site: {site_title}
+Section: {section}
+Blog posts:
+""",
+        'Before & After': """You are optimizing visual gallery content for LLMS.txt files to help AI assistants understand surgical outcomes.
+
+For each gallery page, write LLMS.txt optimized entries.
+
+TITLE requirements:
+- Keep "Before & After" in title for clarity
+- Include the specific procedure name
+- Maintain medical accuracy
+
+DESCRIPTION requirements - Answer: "What transformation does this show?"
+- 15-25 words describing visible results and improvements
+- Focus on patient outcomes: "Shows how..." "Demonstrates results of..."
+- Include recovery timeframe if relevant
+- Use factual, outcome-based language
+
+Example:
+BAD: "View our amazing breast reconstruction before and after gallery."
+GOOD: "Visual documentation shows natural-looking results achieved through DIEP flap reconstruction with minimal scarring."
+
+Site: {site_title}
+Section: {section}
+Gallery pages:
+""",
+    }
+    
+    DEFAULT_ENHANCEMENT_PROMPT = """You are writing LLMS.txt entries that help AI assistants recommend services to users asking questions.
+
+Write entries that answer user questions about services and solutions.
+
+TITLE requirements:
+- Keep existing title if it clearly names the service
+- Only modify to add clarity about what's offered
+- Include medical/technical terms patients search for
+
+DESCRIPTION requirements - Answer: "How does this help patients?"
+- 15-25 words describing the solution and its benefits
+- Start with action: "Provides..." "Offers..." "Delivers..." "Treats..."
+- Include specific outcomes or improvements
+- Avoid marketing language - focus on factual benefits
+
+Example:
+BAD: "Discover our innovative approach to pain management solutions."
+GOOD: "Non-surgical nerve blocks provide immediate pain relief for chronic back conditions lasting 6-12 months."
+
+Site: {site_title}
+Section: {section}
+Pages:
+"""
+    
+    ENHANCEMENT_PROMPT_SUFFIX = """
+Return ONLY a JSON array with enhanced entries:
+[{"index": 1, "title": "...", "description": "..."}, {"index": 2, "title": "...", "description": "..."}, ...]
+
+REMEMBER: Keep titles mostly unchanged unless they're unclear. Focus on writing great descriptions.
+NO other text, NO trailing commas, NO truncation marks like [...] or ..."""
+    
+    def __init__(self, use_gpt: bool = True, api_key: Optional[str] = None,
+                 use_batch_api: bool = False,
+                 cache_path: Optional[str] = ENHANCEMENT_CACHE_PATH):
         # AI enhancement is now mandatory
         self.use_gpt = True
+        # Offline runs can trade latency for the Batch API's lower cost
+        self.use_batch_api = use_batch_api
+        # Unchanged pages reuse earlier enhancements; cache_path=None disables
+        self.cache_path = cache_path
         self.patterns = self.DEFAULT_PATTERNS.copy()
+        self._compile_patterns()
         
         # Always initialize GPT client
         if not api_key:
@@ -85,12 +306,49 @@ class Categorizer:
         if not api_key:
             raise ValueError("OpenAI API key required - AI enhancement is mandatory for optimal LLMS.txt generation")
         
-        self.client = OpenAI(api_key=api_key)
-        self.encoding = tiktoken.encoding_for_model("gpt-3.5-turbo")
+        self.api_key = api_key
+    
+    @functools.cached_property
+    def cache(self) -> Optional[JSONCache]:
+        """Enhancement cache, opened on the first lookup - so constructing a
+        Categorizer creates no .llms_cache/ when nothing gets enhanced
+        """
+        return JSONCache(self.cache_path, table='enhancements') if self.cache_path else None
+    
+    @functools.cached_property
+    def client(self) -> OpenAI:
+        """Sync client for the Batch API, created on first use - building its
+        SSL context is most of the cost of constructing a Categorizer
+        """
+        return OpenAI(api_key=self.api_key)
     
     def update_patterns(self, custom_patterns: Dict[str, List[str]]):
         """Update or add custom categorization patterns"""
         self.patterns.update(custom_patterns)
+        self._compile_patterns()
+    
+    def _compile_patterns(self):
+        """Compile all patterns into one Aho-Corasick automaton
+        
+        Categories are numbered in pattern order (`_category_names`), and each
+        lowercased pattern maps to (pattern, category ids). A pattern listed
+        under several categories, or twice under one, keeps every occurrence
+        so scoring matches a pattern-by-pattern scan.
+        """
+        self._category_names = list(self.patterns)
+        
+        pattern_categories = defaultdict(list)
+        for category_id, category_patterns in enumerate(self.patterns.values()):
+            for pattern in category_patterns:
+                pattern_lower = pattern.lower()
+                if pattern_lower:
+                    pattern_categories[pattern_lower].append(category_id)
+        
+        automaton = ahocorasick.Automaton()
+        for pattern_lower, category_ids in pattern_categories.items():
+            automaton.add_word(pattern_lower, (pattern_lower, tuple(category_ids)))
+        automaton.make_automaton()
+        self._pattern_automaton = automaton
     
     def normalize_url(self, url: str) -> str:
         """Normalize URL for comparison"""
@@ -99,25 +357,29 @@ class Categorizer:
     def extract_url_segments(self, url: str) -> List[str]:
         """Extract meaningful segments from URL"""
         # Remove protocol and domain
-        path = re.sub(r'^https?://[^/]+', '', url)
+        return self._path_segments(_DOMAIN_RE.sub('', url))
+    
+    @staticmethod
+    def _path_segments(path: str) -> List[str]:
+        """Split a URL path (domain already removed) into meaningful segments"""
         # Split by / and - and _
-        segments = re.split(r'[/\-_]', path)
+        segments = path.translate(_SEGMENT_SEPARATORS).split('/')
         # Filter out empty strings and common words
-        return [s for s in segments if s and len(s) > 2]
+        return [s for s in segments if len(s) > 2]
     
     def extract_title_from_url(self, url: str) -> str:
         """Extract a meaningful title from URL when page title is empty"""
-        # Remove protocol and domain
-        path = re.sub(r'^https?://[^/]+/', '', url)
-        
-        # Remove query parameters and fragments
-        path = re.sub(r'[?#].*$', '', path)
+        # Drop protocol, domain, query parameters and fragments
+        path = urlsplit(url).path
         
         # Remove file extension
-        path = re.sub(r'\.[^/]+$', '', path)
+        head, sep, last = path.rpartition('/')
+        dot = last.find('.')
+        if 0 <= dot < len(last) - 1:
+            path = head + sep + last[:dot]
         
         # Handle special cases
-        if not path or path == '/':
+        if not path.strip('/'):
             return 'Homepage'
         
         # Split by / and take the last meaningful segment
@@ -157,8 +419,7 @@ class Categorizer:
         # Clean up truncation marks from descriptions
         if description:
             # Remove various forms of truncation marks
-            description = description.replace('[…]', '').replace('[...]', '').strip()
-            description = description.replace('…', '').strip()
+            description = _TRUNCATION_RE.sub('', description).strip()
             
             # If description ends with incomplete sentence, try to complete it
             if description and not description[-1] in '.!?':
@@ -180,118 +441,99 @@ class Categorizer:
             'description': description
         }
     
-    def pattern_based_categorize(self, page: Dict) -> str:
-        """Enhanced categorization with healthcare-specific logic"""
+    def pattern_based_categorize(self, page: Dict, segments: Optional[List[str]] = None) -> str:
+        """Enhanced categorization with healthcare-specific logic
+        
+        Args:
+            page: Page row from the processed CSV
+            segments: Precomputed URL segments of the normalized URL, if the
+                caller already has them; extracted on demand otherwise
+        """
         url = self.normalize_url(page.get('Address', ''))
         title = page.get('Title 1', '').lower()
         meta = page.get('Meta Description 1', '').lower()
         h1 = page.get('H1-1', '').lower()
         
         # PRIORITY 0: Before & After Detection (HIGHEST PRIORITY)
-        before_after_indicators = [
-            'before-and-after', 'before & after', 'before and after',
-            'transformation', 'results', 'gallery', 'high-definition',
-            'before-after'
-        ]
-        
         # Check URL and title for before & after content
-        for indicator in before_after_indicators:
-            if (indicator in url or indicator in title or 
-                'before & after' in title or 'before and after' in title):
+        if 'before & after' in title or 'before and after' in title:
+            return "Before & After"
+        for indicator in _BEFORE_AFTER_INDICATORS:
+            if indicator in url or indicator in title:
                 return "Before & After"
         
         # PRIORITY 1: Enhanced Blog Content Detection
-        
         # Catch milestone/achievement posts by pattern
-        # Specific healthcare blog indicators
-        healthcare_blog_indicators = [
-            'new surgical center opens',
-            'opens flagship',
-            'featured in forbes',
-            'announcement',
-            'press release',
-            'news:',
-            'study finds',
-            'research shows',
-            'breakthrough',
-            'collaboration',
-            'partnership',
-            'prma celebrates',
-            'prma performs',
-            'prma reaches'
-        ]
-        
-        for indicator in healthcare_blog_indicators:
+        for indicator in _HEALTHCARE_BLOG_INDICATORS:
             if indicator in title or indicator in meta:
                 return "Blog"
         
         # PRIORITY 1: Testimonials Detection (Important for Healthcare)
-        testimonial_indicators = ['testimonial', 'testimonials', 'story', 'stories', 'experience', 'success-story']
-        
-        for indicator in testimonial_indicators:
-            if indicator in url or indicator in title.lower():
+        for indicator in _TESTIMONIAL_INDICATORS:
+            if indicator in url or indicator in title:
                 return "Patient Resources"
         
         # PRIORITY 2: Enhanced Blog Content Detection
-        blog_url_patterns = [
-            '/blog/',                    # Standard: /blog/post-title
-            '-blog/',                    # Healthcare: /surgery-blog/post-title, /plastic-surgery-blog/  
-            '/blog-',                    # Alternative: /blog-category/post
-            'blog/',                     # Edge case: domain.com/blog/post
-            '/news/',                    # News sections
-            '/articles/',                # Article sections
-            '/insights/',                # Insights/thought leadership
-        ]
-        
         # Also check if 'blog' appears in URL path (not domain)
-        url_path = re.sub(r'^https?://[^/]+', '', url)  # Remove domain
+        url_path = _DOMAIN_RE.sub('', url)  # Remove domain
         if 'blog' in url_path and url_path.count('/') >= 2:  # At least /something-blog/post structure
             return "Blog"
         
-        for pattern in blog_url_patterns:
+        for pattern in _BLOG_URL_PATTERNS:
             if pattern in url:
                 return "Blog"
         
         # PRIORITY 3: URL Structure Categorization
-        if ('/patient-information/' in url or '/patient-resources/' in url or 
-            '/testimonials/' in url or '/testimonial/' in url):
-            return "Patient Resources"
-        
-        if '/locations/' in url:
-            return "Locations"
-        
-        if ('/physicians/' in url or '/providers/' in url or 
-            '/breast-reconstruction-surgeons/' in url):
-            return "Providers"
-        
-        if '/services/' in url or '/cosmetic-surgery/' in url:
-            return "Services"
+        for category, url_patterns in _URL_STRUCTURE_CATEGORIES:
+            for pattern in url_patterns:
+                if pattern in url:
+                    return category
         
         # PRIORITY 4: Content-based pattern matching
         combined_text = f"{url} {title} {meta} {h1}"
-        url_segments = self.extract_url_segments(url)
-        
-        # Score each category
-        category_scores = defaultdict(int)
+        # Reuse the domain-stripped path from the blog check above
+        url_segments = segments if segments is not None else self._path_segments(url_path)
+        
+        # Find every pattern in combined text with a single automaton pass
+        automaton = self._pattern_automaton
+        matched = {
+            pattern_lower: category_ids
+            for _, (pattern_lower, category_ids) in automaton.iter(combined_text)
+        }
         
-        for category, patterns in self.patterns.items():
-            for pattern in patterns:
-                pattern_lower = pattern.lower()
-                # Check in combined text
-                if pattern_lower in combined_text:
-                    category_scores[category] += 2
-                # Check in URL segments (higher weight)
-                for segment in url_segments:
-                    if pattern_lower in segment:
-                        category_scores[category] += 3
-        
-        # Return category with highest score, or "Other"
-        if category_scores:
-            return max(category_scores.items(), key=lambda x: x[1])[0]
+        # Score each category, indexed by category id
+        scores = [0] * len(self._category_names)
+        
+        for category_ids in matched.values():
+            for category_id in category_ids:
+                scores[category_id] += 2
+        
+        # Check in URL segments (higher weight) - each distinct pattern
+        # counts once per segment it appears in
+        for segment in url_segments:
+            segment_matched = {
+                pattern_lower: category_ids
+                for _, (pattern_lower, category_ids) in automaton.iter(segment)
+            }
+            for category_ids in segment_matched.values():
+                for category_id in category_ids:
+                    scores[category_id] += 3
+        
+        # Return category with highest score, or "Other".
+        # Ties go to the category listed first in the patterns
+        best_score = max(scores, default=0)
+        if best_score:
+            return self._category_names[scores.index(best_score)]
         return "Other"
     
-    def categorize_pages(self, pages: List[Dict], site_metadata: Dict) -> Dict[str, List[Dict]]:
-        """Main categorization method - ALWAYS use patterns, optionally enhance"""
+    def categorize_pages(self, pages: Iterable[Dict], site_metadata: Dict) -> Dict[str, List[Dict]]:
+        """Main categorization method - ALWAYS use patterns, optionally enhance
+        
+        `pages` can be any iterable; it is deduplicated into a list first.
+        """
+        
+        # Categorize and enhance each URL only once
+        pages = self._deduplicate_pages(pages)
         
         # ALWAYS use pattern-based categorization for accuracy
         logger.info("Using enhanced pattern-based categorization for healthcare...")
@@ -299,50 +541,174 @@ class Categorizer:
         
         # Always enhance with GPT for optimal LLMS.txt
         logger.info("Enhancing titles and descriptions with AI for LLMS.txt optimization...")
-        categorized = self._enhance_categorized_content(categorized, site_metadata)
+        if self.use_batch_api:
+            categorized = self._enhance_via_batch_api(categorized, site_metadata)
+        else:
+            categorized = self._enhance_categorized_content(categorized, site_metadata)
         
         return categorized
     
+    def _deduplicate_pages(self, pages: Iterable[Dict]) -> List[Dict]:
+        """Keep one page per normalized URL - the one with the longest title
+        
+        Pages stay in first-seen order; a later duplicate with a longer title
+        takes its predecessor's place.
+        """
+        seen = {}
+        total = 0
+        for page in pages:
+            total += 1
+            key = self.normalize_url(page.get('Address', ''))
+            current = seen.get(key)
+            if current is None or len(page.get('Title 1', '')) > len(current.get('Title 1', '')):
+                seen[key] = page
+        
+        if total > len(seen):
+            logger.info(f"Skipping {total - len(seen)} duplicate URLs")
+        
+        return list(seen.values())
+    
+    def _categorize_one(self, page: Dict) -> Tuple[str, Dict]:
+        """Categorize a single page and prepare its display entry"""
+        category = self.pattern_based_categorize(page)
+        
+        # Prepare page entry with proper display data
+        page_entry = self.prepare_page_for_display(page)
+        
+        return category, page_entry
+    
     def _pattern_categorize_all(self, pages: List[Dict]) -> Dict[str, List[Dict]]:
         """Categorize all pages using enhanced patterns"""
         categorized = defaultdict(list)
         
-        for page in pages:
-            category = self.pattern_based_categorize(page)
-            
-            # Prepare page entry with proper display data
-            page_entry = self.prepare_page_for_display(page)
-            
+        # A worker pool only pays off for large crawls
+        if len(pages) >= self.PARALLEL_CATEGORIZE_MIN_PAGES and (os.cpu_count() or 1) > 1:
+            results = self._categorize_in_processes(pages)
+        else:
+            results = map(self._categorize_one, pages)
+        
+        for category, page_entry in results:
             categorized[category].append(page_entry)
         
         # Sort categories by priority, then by number of pages
-        category_priority = {
-            "About": 1,
-            "Services": 2, 
-            "Before & After": 3,
-            "Providers": 4,
-            "Locations": 5,
-            "Patient Resources": 6,
-            "Blog": 7,
-            "Areas Treated": 8,
-            "Other": 99
-        }
-        
         sorted_categories = dict(
             sorted(categorized.items(), 
-                   key=lambda x: (category_priority.get(x[0], 50), -len(x[1])))
+                   key=lambda x: (self.CATEGORY_PRIORITY.get(x[0], 50), -len(x[1])))
         )
         
         return sorted_categories
     
+    def _categorize_in_processes(self, pages: List[Dict]) -> Iterable[Tuple[str, Dict]]:
+        """Categorize pages in chunks across a process pool, keeping page order"""
+        # Only ship the fields categorization reads - crawl rows carry dozens
+        slim_pages = [
+            {field: page[field] for field in _CATEGORIZE_FIELDS if field in page}
+            for page in pages
+        ]
+        chunk_size = self.PARALLEL_CATEGORIZE_CHUNK_SIZE
+        chunks = [slim_pages[i:i+chunk_size] for i in range(0, len(slim_pages), chunk_size)]
+        
+        with ProcessPoolExecutor(initializer=_init_categorize_worker,
+                                 initargs=(self.patterns,)) as executor:
+            for chunk_results in executor.map(_categorize_chunk, chunks):
+                yield from chunk_results
+    
     def _enhance_categorized_content(self, categorized: Dict[str, List[Dict]], 
                                    site_metadata: Dict) -> Dict[str, List[Dict]]:
         """Enhance both titles and descriptions for already-categorized pages"""
+        jobs, cache_keys = self._enhancement_jobs(categorized, site_metadata)
+        
+        if jobs:
+            results = asyncio.run(self._enhance_batches(jobs, site_metadata))
+            self._cache_enhancements(results, cache_keys)
+        
+        return categorized
+    
+    def _enhance_via_batch_api(self, categorized: Dict[str, List[Dict]],
+                               site_metadata: Dict) -> Dict[str, List[Dict]]:
+        """Enhance content through the OpenAI Batch API
+        
+        Submits every enhancement batch as one offline job - half the token
+        cost of live requests and no RPM throttling, but results can take up
+        to 24 hours. Blocks while polling the job every BATCH_POLL_INTERVAL
+        seconds.
+        """
+        jobs, cache_keys = self._enhancement_jobs(categorized, site_metadata)
+        if not jobs:
+            return categorized
+        
+        prompt_prefixes = self._enhancement_prompt_prefixes(jobs, site_metadata)
+        
+        # One JSONL request per batch; custom_id maps results back to the job
+        requests = [
+            json.dumps({
+                "custom_id": f"{section}:{job_idx}",
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": self._enhancement_request(prompt_prefixes[section], batch)
+            })
+            for job_idx, (section, batch) in enumerate(jobs)
+        ]
+        input_file = self.client.files.create(
+            file=("llms_enhancements.jsonl", "\n".join(requests).encode("utf-8")),
+            purpose="batch"
+        )
+        batch_job = self.client.batches.create(
+            input_file_id=input_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h"
+        )
+        logger.info(f"Submitted {len(jobs)} enhancement batches as Batch API job {batch_job.id}")
+        
+        while batch_job.status not in ("completed", "failed", "expired", "cancelled"):
+            time.sleep(self.BATCH_POLL_INTERVAL)
+            batch_job = self.client.batches.retrieve(batch_job.id)
+        
+        # Batches without a usable result keep their original content
+        results = [None] * len(jobs)
+        
+        if batch_job.status != "completed" or not batch_job.output_file_id:
+            logger.warning(f"Batch API job {batch_job.id} {batch_job.status}, keeping original content")
+            return categorized
+        
+        output = self.client.files.content(batch_job.output_file_id).text
+        for line in output.splitlines():
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            job_idx = int(record["custom_id"].rsplit(":", 1)[1])
+            response = record.get("response") or {}
+            
+            if response.get("status_code") != 200:
+                logger.warning(f"Enhancement failed for batch {record['custom_id']}: {record.get('error')}")
+                continue
+            
+            try:
+                content = response["body"]["choices"][0]["message"]["content"]
+                results[job_idx] = self._apply_enhancements(jobs[job_idx][1], content)
+            except Exception as e:
+                logger.warning(f"Enhancement failed for batch {record['custom_id']}: {e}")
+        
+        self._cache_enhancements(results, cache_keys)
+        
+        return categorized
+    
+    def _enhancement_jobs(self, categorized: Dict[str, List[Dict]],
+                          site_metadata: Dict) -> Tuple[List[Tuple[str, List[Dict]]], Dict[int, str]]:
+        """Split the enhanced sections into (section, batch of 10 pages) jobs
+        
+        Pages with a cached enhancement are updated in place and left out of
+        the jobs. Also returns the cache key of every queued page, keyed by
+        id() of its entry - the key hashes the original content, which the
+        enhancement then overwrites.
+        """
         
         # Include all main sections for enhancement
         sections_to_enhance = ['Services', 'Before & After', 'Providers', 'Locations', 'Blog']
-        enhanced_categorized = categorized.copy()
+        site_title = site_metadata.get('site_title', '')
         
+        jobs = []
+        cache_keys = {}
         for section in sections_to_enhance:
             if section not in categorized or not categorized[section]:
                 continue
@@ -350,109 +716,97 @@ class Categorizer:
             logger.info(f"Enhancing {len(categorized[section])} {section} titles and descriptions...")
             
             pages = categorized[section]
-            enhanced_pages = []
             
-            # Process in batches of 10
-            for i in range(0, len(pages), 10):
-                batch = pages[i:i+10]
-                
-                # Customize prompt based on section
-                if section == 'Blog':
-                    prompt = f"""You are optimizing blog content specifically for LLMS.txt files to help AI search engines understand and recommend articles.
-Site: {site_metadata.get('site_title', '')}
-
-For each blog post below, write LLMS.txt optimized entries.
-
-TITLE requirements:
-- Keep the existing title if it's already clear and specific
-- Only modify if it contains site branding or is too vague
-- Ensure it describes what the article is about
-
-DESCRIPTION requirements - Answer: "What will readers learn from this?"
-- 15-25 words focusing on key takeaways and insights
-- Use conversational language: "Explains how..." "Shows why..." "Reveals what..."
-- Include specific benefits or knowledge gained
-- NO SEO phrases like "Learn about" or "Discover"
-
-Example:
-BAD: "Learn about our latest breast reconstruction techniques and innovations."
-GOOD: "New microsurgical techniques reduce recovery time and improve natural tissue reconstruction outcomes."
-
-Blog posts:
-"""
-                elif section == 'Before & After':
-                    prompt = f"""You are optimizing visual gallery content for LLMS.txt files to help AI assistants understand surgical outcomes.
-Site: {site_metadata.get('site_title', '')}
-
-For each gallery page, write LLMS.txt optimized entries.
-
-TITLE requirements:
-- Keep "Before & After" in title for clarity
-- Include the specific procedure name
-- Maintain medical accuracy
-
-DESCRIPTION requirements - Answer: "What transformation does this show?"
-- 15-25 words describing visible results and improvements
-- Focus on patient outcomes: "Shows how..." "Demonstrates results of..."
-- Include recovery timeframe if relevant
-- Use factual, outcome-based language
-
-Example:
-BAD: "View our amazing breast reconstruction before and after gallery."
-GOOD: "Visual documentation shows natural-looking results achieved through DIEP flap reconstruction with minimal scarring."
-
-Gallery pages:
-"""
-                else:
-                    prompt = f"""You are writing LLMS.txt entries that help AI assistants recommend services to users asking questions.
-Site: {site_metadata.get('site_title', '')}
-Section: {section}
-
-Write entries that answer user questions about services and solutions.
-
-TITLE requirements:
-- Keep existing title if it clearly names the service
-- Only modify to add clarity about what's offered
-- Include medical/technical terms patients search for
-
-DESCRIPTION requirements - Answer: "How does this help patients?"
-- 15-25 words describing the solution and its benefits
-- Start with action: "Provides..." "Offers..." "Delivers..." "Treats..."
-- Include specific outcomes or improvements
-- Avoid marketing language - focus on factual benefits
-
-Example:
-BAD: "Discover our innovative approach to pain management solutions."
-GOOD: "Non-surgical nerve blocks provide immediate pain relief for chronic back conditions lasting 6-12 months."
-
-Pages:
-"""
+            if self.cache:
+                keys = [self._enhancement_cache_key(section, site_title, page) for page in pages]
+                cached = self.cache.get_many(keys)
+                misses = []
+                for key, page in zip(keys, pages):
+                    if key in cached:
+                        page.update(cached[key])
+                    else:
+                        misses.append(page)
+                        cache_keys[id(page)] = key
                 
-                for j, page in enumerate(batch):
-                    current_title = page['title']
-                    current_desc = page.get('description', '')
-                    
-                    # Clean up [...] from existing descriptions before sending to GPT
-                    if current_desc:
-                        current_desc = current_desc.replace('[…]', '').replace('[...]', '').replace('…', '').strip()
-                    
-                    prompt += f"\n{j+1}. URL: {page['url']}"
-                    prompt += f"\n   Page Topic: {current_title}"  # Use as context, not template
-                    # Don't show the meta description at all - it anchors GPT too much
+                if cached:
+                    logger.info(f"✓ Reused {len(pages) - len(misses)} cached {section} enhancements")
+                pages = misses
+            
+            for i in range(0, len(pages), 10):
+                jobs.append((section, pages[i:i+10]))
+        
+        return jobs, cache_keys
+    
+    @staticmethod
+    def _enhancement_cache_key(section: str, site_title: str, page: Dict) -> str:
+        """Hash everything that goes into a page's enhancement prompt"""
+        raw = "|".join([
+            section,
+            site_title,
+            page.get('url', ''),
+            page.get('title', ''),
+            page.get('description', '')
+        ])
+        return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+    
+    def _cache_enhancements(self, results: List[Optional[List[Dict]]],
+                            cache_keys: Dict[int, str]):
+        """Store the pages GPT enhanced in the cache
+        
+        Each result lists the entries its batch's reply updated; pages the
+        reply skipped, and whole batches that failed, stay uncached so the
+        next run sends them again.
+        """
+        if not self.cache:
+            return
+        
+        to_cache = {}
+        for enhanced_pages in results:
+            if enhanced_pages is None:
+                continue  # Originals were kept on error
+            
+            for page in enhanced_pages:
+                to_cache[cache_keys[id(page)]] = {
+                    'title': page['title'],
+                    'description': page.get('description', '')
+                }
+        
+        self.cache.set_many(to_cache)
+    
+    async def _enhance_batches(self, jobs: List[Tuple[str, List[Dict]]],
+                               site_metadata: Dict) -> List[Optional[List[Dict]]]:
+        """Send enhancement batches concurrently, ENHANCEMENT_CONCURRENCY at a time"""
+        semaphore = asyncio.Semaphore(self.ENHANCEMENT_CONCURRENCY)
+        prompt_prefixes = self._enhancement_prompt_prefixes(jobs, site_metadata)
+        
+        # One client per run - its connection pool is tied to this event loop
+        async with AsyncOpenAI(api_key=self.api_key) as client:
+            async def run(section: str, batch: List[Dict]) -> Optional[List[Dict]]:
+                async with semaphore:
+                    return await self._enhance_batch(client, prompt_prefixes[section], batch)
+            
+            return await asyncio.gather(*(run(section, batch) for section, batch in jobs))
+    
+    async def _enhance_batch(self, client: AsyncOpenAI, prompt_prefix: str,
+                             batch: List[Dict]) -> Optional[List[Dict]]:
+        """Enhance one batch of pages - returns the updated entries, or None if GPT fails"""
+        try:
+            response = await client.chat.completions.create(
+                **self._enhancement_request(prompt_prefix, batch)
+            )
+            return self._apply_enhancements(batch, response.choices[0].message.content)
                 
-                prompt += """
-Return ONLY a JSON array with enhanced entries:
-[{"index": 1, "title": "...", "description": "..."}, {"index": 2, "title": "...", "description": "..."}, ...]
-
-REMEMBER: Keep titles mostly unchanged unless they're unclear. Focus on writing great descriptions.
-NO other text, NO trailing commas, NO truncation marks like [...] or ..."""
-
-                try:
-                    response = self.client.chat.completions.create(
-                        model="gpt-3.5-turbo",
-                        messages=[
-                            {"role": "system", 
-                             "content": """You are writing llms.txt entries - NOT rewriting SEO metadata.
+        except Exception as e:
+            logger.warning(f"Enhancement failed for batch: {e}")
+            return None
+    
+    def _enhancement_request(self, prompt_prefix: str, batch: List[Dict]) -> Dict:
+        """Chat completion parameters for one enhancement batch"""
+        return {
+            "model": "gpt-3.5-turbo",
+            "messages": [
+                        {"role": "system", 
+                         "content": """You are writing llms.txt entries - NOT rewriting SEO metadata.
 
 Your goal: Write descriptions that help AI assistants recommend these pages when users ask questions.
 
@@ -466,92 +820,103 @@ CRITICAL RULES:
 BAD: "Learn about our breast augmentation services and procedures."
 GOOD: "Board-certified surgeons perform breast augmentation with natural-looking results and personalized sizing consultations."
 """},
-                            {"role": "user", "content": prompt}
-                        ],
-                        temperature=0.7,
-                        max_tokens=800
-                    )
-                    
-                    content = response.choices[0].message.content.strip()
-                    
-                    # Extract JSON more carefully
-                    # Remove any markdown formatting
-                    content = content.replace('```json', '').replace('```', '')
-                    
-                    # Find the JSON array
-                    start = content.find('[')
-                    end = content.rfind(']') + 1
-                    
-                    if start != -1 and end > start:
-                        json_str = content[start:end]
-                        
-                        # Clean common issues
-                        json_str = re.sub(r',\s*]', ']', json_str)  # Remove trailing commas
-                        json_str = re.sub(r',\s*}', '}', json_str)
-                        
-                        improvements = json.loads(json_str)
-                        
-                        # Create enhanced batch
-                        enhanced_batch = batch.copy()
-                        for item in improvements:
-                            idx = item.get('index', 0) - 1
-                            if 0 <= idx < len(enhanced_batch):
-                                enhanced_batch[idx] = batch[idx].copy()
-                                # Update title if provided
-                                if 'title' in item and item['title']:
-                                    enhanced_batch[idx]['title'] = item['title']
-                                # Update description if provided
-                                if 'description' in item and item['description']:
-                                    enhanced_batch[idx]['description'] = item['description']
-                        
-                        enhanced_pages.extend(enhanced_batch)
-                        logger.info(f"✓ Enhanced {len(improvements)} titles and descriptions")
-                    else:
-                        # If parsing fails, keep originals
-                        enhanced_pages.extend(batch)
-                        logger.warning("Could not parse GPT response, keeping original content")
-                        
-                except Exception as e:
-                    logger.warning(f"Enhancement failed for batch: {e}")
-                    enhanced_pages.extend(batch)  # Keep originals on error
-            
-            # Update the section with enhanced pages
-            enhanced_categorized[section] = enhanced_pages
-        
-        return enhanced_categorized
+                {"role": "user", "content": self._build_enhancement_prompt(prompt_prefix, batch)}
+            ],
+            "temperature": 0.7,
+            "max_tokens": 800
+        }
     
-    # Keep deprecated methods for backward compatibility
-    def prepare_page_for_gpt(self, page: Dict) -> Dict:
-        """DEPRECATED - Only used in old GPT categorization"""
-        display_data = self.prepare_page_for_display(page)
+    def _apply_enhancements(self, batch: List[Dict], content: str) -> Optional[List[Dict]]:
+        """Merge GPT's JSON improvements into the batch's page entries in place
+        
+        Returns the entries GPT actually updated - pages its reply skipped
+        are left out, so they aren't cached as enhanced - or None if the
+        response holds no JSON array. Raises if the array itself can't be
+        parsed.
+        """
+        content = content.strip()
+        
+        # Extract JSON more carefully
+        # Remove any markdown formatting
+        content = content.replace('```json', '').replace('```', '')
+        
+        # Find the JSON array
+        start = content.find('[')
+        end = content.rfind(']') + 1
+        
+        if start == -1 or end <= start:
+            # If parsing fails, keep originals
+            logger.warning("Could not parse GPT response, keeping original content")
+            return None
+        
+        json_str = content[start:end]
+        
+        # Clean common issues - remove trailing commas
+        json_str = _TRAILING_COMMA_RE.sub(r'\1', json_str)
+        
+        improvements = _json_loads(json_str)
+        
+        # Update the page entries directly - they belong to this run
+        updated = set()
+        for item in improvements:
+            idx = item.get('index', 0) - 1
+            if 0 <= idx < len(batch):
+                # Update title if provided
+                if item.get('title'):
+                    batch[idx]['title'] = item['title']
+                    updated.add(idx)
+                # Update description if provided
+                if item.get('description'):
+                    batch[idx]['description'] = item['description']
+                    updated.add(idx)
+        
+        logger.info(f"✓ Enhanced {len(updated)} titles and descriptions")
+        return [batch[idx] for idx in sorted(updated)]
+    
+    def _enhancement_prompt_prefixes(self, jobs: List[Tuple[str, List[Dict]]],
+                                     site_metadata: Dict) -> Dict[str, str]:
+        """Format the static opening of each job section's prompt once"""
+        site_title = site_metadata.get('site_title', '')
         return {
-            "url": display_data['url'],
-            "title": display_data['title'][:100],
-            "meta": display_data['description'][:150],
-            "h1": page.get("H1-1", "")[:100]
+            section: self.ENHANCEMENT_PROMPTS.get(section, self.DEFAULT_ENHANCEMENT_PROMPT).format(
+                site_title=site_title, section=section
+            )
+            for section, _ in jobs
         }
     
-    def estimate_tokens(self, pages: List[Dict]) -> int:
-        """DEPRECATED - Only used in old GPT categorization"""
-        simplified = [self.prepare_page_for_gpt(p) for p in pages]
-        content = json.dumps(simplified)
-        return len(self.encoding.encode(content))
-    
-    def gpt_categorize_batch(self, pages: List[Dict], site_context: str = "") -> Dict[str, List[Dict]]:
-        """DEPRECATED - Don't use GPT for categorization"""
-        logger.warning("gpt_categorize_batch is deprecated. Use pattern-based categorization instead.")
-        # Fallback to pattern-based
-        fallback_results = defaultdict(list)
-        for page in pages:
-            category = self.pattern_based_categorize(page)
-            page_entry = self.prepare_page_for_display(page)
-            fallback_results[category].append(page_entry)
-        return dict(fallback_results)
-    
-    def _gpt_categorize_all(self, pages: List[Dict], site_metadata: Dict) -> Dict[str, List[Dict]]:
-        """DEPRECATED - Don't use GPT for categorization"""
-        logger.warning("GPT categorization is deprecated. Using pattern-based categorization instead.")
-        return self._pattern_categorize_all(pages)
+    def _build_enhancement_prompt(self, prompt_prefix: str, batch: List[Dict]) -> str:
+        """Build the user prompt for one enhancement batch"""
+        buf = [prompt_prefix]
+        
+        for j, page in enumerate(batch):
+            current_title = page['title']
+            
+            buf.append(f"\n{j+1}. URL: {page['url']}")
+            buf.append(f"\n   Page Topic: {current_title}")  # Use as context, not template
+            # Don't show the meta description at all - it anchors GPT too much
+        
+        buf.append(self.ENHANCEMENT_PROMPT_SUFFIX)
+        
+        return ''.join(buf)
+    
+    # Deprecated GPT categorization helpers that have been removed
+    _REMOVED_METHODS = {
+        'prepare_page_for_gpt': 'prepare_page_for_display',
+        'estimate_tokens': None,
+        'gpt_categorize_batch': 'pattern_based_categorize',
+        '_gpt_categorize_all': '_pattern_categorize_all',
+    }
+    
+    def __getattr__(self, name: str):
+        """Give a clear error for removed deprecated methods"""
+        if name in Categorizer._REMOVED_METHODS:
+            replacement = Categorizer._REMOVED_METHODS[name]
+            hint = f" Use {replacement} instead." if replacement else ""
+            raise AttributeError(
+                f"Categorizer.{name} was deprecated and has been removed - "
+                f"GPT is no longer used for categorization.{hint}"
+            )
+        raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
 
     # BACKWARD COMPATIBILITY - Keep old method name
     def _enhance_categorized_descriptions(self, categorized: Dict[str, List[Dict]], 
@@ -3,13 +3,69 @@
 Handles Screaming Frog CSV processing and validation
 """
 import pandas as pd
+import numpy as np
 import os
 import re
-from typing import Dict, List, Tuple, Optional
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Tuple, Optional
 import logging
 
+try:
+    # Optional - lets pandas run the string filters in Arrow's C++ kernels
+    import pyarrow
+except ImportError:
+    pyarrow = None
+
 logger = logging.getLogger(__name__)
 
+# URL patterns counted by the CSV quality analysis
+_IMAGE_RE = re.compile(r'\.(?:jpg|jpeg|png|gif|webp|svg|ico)(?:\?|$)', re.IGNORECASE)
+_ASSET_RE = re.compile(r'\.(?:css|js|json|xml|pdf|woff|woff2|ttf|eot)(?:\?|$)', re.IGNORECASE)
+_HUBSPOT_RE = re.compile(r'/(?:hs-fs|hub_generated|_hcms|hs)/')
+
+# A bare domain URL, which is taken as the site's homepage
+_HOMEPAGE_RE = re.compile(r'^https?://[^/]+/?$')
+
+# File extensions to exclude from content pages
+_NON_CONTENT_EXTENSIONS = [
+    '.jpg', '.jpeg', '.png', '.gif', '.webp', '.svg', '.ico',
+    '.css', '.js', '.json', '.xml', '.pdf', 
+    '.woff', '.woff2', '.ttf', '.eot',
+    '.mp4', '.mp3', '.avi', '.mov',
+    '.zip', '.tar', '.gz'
+]
+# Matched at the end of the path, with or without a query string
+_NON_CONTENT_RE = re.compile(
+    r'\.(?:%s)(?:\?|$)' % '|'.join(re.escape(ext[1:]) for ext in _NON_CONTENT_EXTENSIONS),
+    re.IGNORECASE
+)
+
+# Common CMS junk pages
+_CMS_JUNK_PATTERNS = [
+    r'/tag/',
+    r'/category/', 
+    r'/author/',
+    r'/page/\d+',  # Pagination
+    r'/\d{4}/\d{2}/',  # Date archives like /2024/05/
+    r'/feed/',
+    r'/wp-',  # WordPress system pages
+    r'/hs-',  # HubSpot system pages
+]
+# HubSpot system URLs and CMS junk pages, matched in a single pass
+_JUNK_URL_RE = re.compile('|'.join([_HUBSPOT_RE.pattern] + _CMS_JUNK_PATTERNS))
+
+# Blog tag/archive pages by title pattern
+_BLOG_ARCHIVE_PATTERNS = [
+    # Pattern for "X Blog | Y" where Y is a tag/category/author
+    r'Blog\s*\|\s*(?:Admin|Dr\.|Awards|Tags?|Categories?|Archives?|Health|News|Media|Hernia|Melanoma|Pain)',
+    # Pattern for generic blog archive pages
+    r'^\s*[^|]+Blog\s*$',  # Just "Something Blog" with no real content
+    # Pattern for tag pages that might not have /tag/ in URL
+    r'\|\s*Latest news for',  # Common WordPress archive page pattern
+]
+_BLOG_ARCHIVE_RE = re.compile('|'.join(f'(?:{pattern})' for pattern in _BLOG_ARCHIVE_PATTERNS))
+
+
 class CSVProcessor:
     """Process and validate Screaming Frog CSV exports"""
     
@@ -28,28 +84,58 @@ class CSVProcessor:
         'Content Type'
     ]
     
+    # Known columns parsed as text instead of inferring a type
+    TEXT_COLUMNS = [
+        'Address',
+        'Title 1',
+        'Meta Description 1',
+        'H1-1',
+        'Content Type'
+    ]
+    
+    # Text columns filtered with .str methods - Arrow-backed when pyarrow is available
+    STRING_COLUMNS = [
+        'Address',
+        'Title 1',
+        'Meta Description 1'
+    ]
+    
+    # Low-cardinality columns compared against fixed values - read as categoricals
+    CATEGORY_COLUMNS = [
+        'Indexability'
+    ]
+    
+    # Exports larger than this are filtered chunk by chunk to cap peak memory
+    CHUNKED_PROCESSING_MIN_MB = 50
+    CHUNK_SIZE = 250_000
+    
     def __init__(self, csv_path: str):
         self.csv_path = csv_path
         self.df = None
+        # Every column in the CSV header - self.df only loads the known ones
+        self.columns = None
         self.processed_data = None
+        # Set by validate_file, from the same stat that checks the file exists
+        self.file_size_mb = None
         
     def validate_file(self) -> Tuple[bool, Optional[str]]:
         """Validate CSV file exists and is readable"""
-        if not os.path.exists(self.csv_path):
+        try:
+            self.file_size_mb = os.stat(self.csv_path).st_size / (1024 * 1024)
+        except OSError:
             return False, f"File not found: {self.csv_path}"
         
         if not self.csv_path.lower().endswith('.csv'):
             return False, "File must be a CSV"
         
         # Check file size (warn if > 200MB)
-        file_size_mb = os.path.getsize(self.csv_path) / (1024 * 1024)
-        if file_size_mb > 200:
-            logger.warning(f"Large file detected: {file_size_mb:.1f}MB. Processing may be slow.")
+        if self.file_size_mb > 200:
+            logger.warning(f"Large file detected: {self.file_size_mb:.1f}MB. Processing may be slow.")
         
         return True, None
     
     def load_csv(self, chunk_size: Optional[int] = None) -> pd.DataFrame:
-        """Load CSV with proper error handling"""
+        """Load the known columns of the CSV with proper error handling"""
         try:
             if chunk_size:
                 # For very large files, return an iterator
@@ -57,28 +143,74 @@ class CSVProcessor:
                     self.csv_path,
                     chunksize=chunk_size,
                     encoding='utf-8',
-                    low_memory=False
+                    low_memory=False,
+                    **self._read_options('utf-8')
                 )
             else:
-                self.df = pd.read_csv(
-                    self.csv_path,
-                    encoding='utf-8',
-                    low_memory=False
-                )
+                self.df = self._read_csv('utf-8')
                 return self.df
         except UnicodeDecodeError:
             # Try with different encoding
-            self.df = pd.read_csv(
-                self.csv_path,
-                encoding='latin-1',
-                low_memory=False
-            )
+            self.df = self._read_csv('latin-1')
             return self.df
         except pd.errors.EmptyDataError:
             raise ValueError("CSV file is empty")
         except Exception as e:
             raise ValueError(f"Error reading CSV: {str(e)}")
     
+    def _read_csv(self, encoding: str) -> pd.DataFrame:
+        """Read the whole CSV, with pyarrow's multi-threaded parser when installed
+        
+        Falls back to the pandas C parser for files Arrow rejects (ragged rows,
+        bad bytes for the encoding), so behaviour matches the plain read_csv.
+        """
+        read_options = self._read_options(encoding)
+        if pyarrow is not None:
+            # The pyarrow engine turns nulls into 'None' for str columns, so read
+            # every text column as Arrow strings and hand the rest back as
+            # object columns with NaN, as the C parser would produce
+            object_columns = [col for col, dtype in read_options['dtype'].items() if dtype is str]
+            try:
+                df = pd.read_csv(
+                    self.csv_path,
+                    encoding=encoding,
+                    engine='pyarrow',
+                    usecols=read_options['usecols'],
+                    dtype={col: 'string[pyarrow]' if dtype is str else dtype
+                           for col, dtype in read_options['dtype'].items()}
+                )
+            except (pyarrow.ArrowInvalid, pd.errors.ParserError) as e:
+                logger.warning(f"pyarrow could not parse the CSV, using the pandas parser: {e}")
+            else:
+                for col in object_columns:
+                    df[col] = df[col].to_numpy(dtype=object, na_value=np.nan)
+                return df
+        
+        return pd.read_csv(self.csv_path, encoding=encoding, low_memory=False, **read_options)
+    
+    def _read_options(self, encoding: str) -> Dict:
+        """usecols/dtype for pd.read_csv, from a header-only read into self.columns
+        
+        Only required and optional columns are parsed. Text columns skip type
+        inference, and the ones the filters scan are stored as Arrow strings
+        when pyarrow is installed. CATEGORY_COLUMNS are read as categoricals.
+        """
+        self.columns = list(pd.read_csv(self.csv_path, nrows=0, encoding=encoding).columns)
+        
+        known_columns = self.REQUIRED_COLUMNS + self.OPTIONAL_COLUMNS
+        dtype = {}
+        for col in self.TEXT_COLUMNS:
+            if col in self.columns:
+                dtype[col] = 'string[pyarrow]' if pyarrow is not None and col in self.STRING_COLUMNS else str
+        for col in self.CATEGORY_COLUMNS:
+            if col in self.columns:
+                dtype[col] = 'category'
+        
+        return {
+            'usecols': [col for col in self.columns if col in known_columns],
+            'dtype': dtype
+        }
+    
     def validate_columns(self) -> Tuple[bool, List[str]]:
         """Check if required columns exist"""
         if self.df is None:
@@ -86,7 +218,7 @@ class CSVProcessor:
         
         missing_columns = []
         for col in self.REQUIRED_COLUMNS:
-            if col not in self.df.columns:
+            if col not in self.columns:
                 missing_columns.append(col)
         
         if missing_columns:
@@ -100,13 +232,13 @@ class CSVProcessor:
             return {}
         
         info = {
-            "total_columns": len(self.df.columns),
+            "total_columns": len(self.columns),
             "required_present": [],
             "optional_present": [],
             "additional_columns": []
         }
         
-        for col in self.df.columns:
+        for col in self.columns:
             if col in self.REQUIRED_COLUMNS:
                 info["required_present"].append(col)
             elif col in self.OPTIONAL_COLUMNS:
@@ -118,20 +250,27 @@ class CSVProcessor:
     
     def analyze_csv_quality(self, df: pd.DataFrame) -> Dict:
         """Analyze if the CSV appears to be properly filtered"""
-        
-        total_rows = len(df)
-        
-        # Count different types of URLs
-        image_pattern = r'\.(jpg|jpeg|png|gif|webp|svg|ico)(\?|$)'
-        asset_pattern = r'\.(css|js|json|xml|pdf|woff|woff2|ttf|eot)(\?|$)'
-        hubspot_pattern = r'/(hs-fs|hub_generated|_hcms|hs)/'
-        
-        image_count = df['Address'].str.contains(image_pattern, regex=True, na=False, case=False).sum()
-        asset_count = df['Address'].str.contains(asset_pattern, regex=True, na=False, case=False).sum()
-        hubspot_count = df['Address'].str.contains(hubspot_pattern, regex=True, na=False).sum()
-        
-        # Count pages with empty titles
-        empty_titles = (df['Title 1'].isna() | (df['Title 1'].str.strip() == '')).sum()
+        return self._summarize_quality(self._count_quality(df))
+    
+    def _count_quality(self, df: pd.DataFrame) -> Dict:
+        """Count the URL types analyze_csv_quality scores - summable across chunks"""
+        return {
+            'total_rows': len(df),
+            # Count different types of URLs
+            'image_count': df['Address'].str.contains(_IMAGE_RE, na=False).sum(),
+            'asset_count': df['Address'].str.contains(_ASSET_RE, na=False).sum(),
+            'hubspot_count': df['Address'].str.contains(_HUBSPOT_RE, na=False).sum(),
+            # Count pages with empty titles
+            'empty_titles': (df['Title 1'].isna() | (df['Title 1'].str.strip() == '')).sum()
+        }
+    
+    def _summarize_quality(self, counts: Dict) -> Dict:
+        """Score CSV quality from _count_quality counts"""
+        total_rows = counts['total_rows']
+        image_count = counts['image_count']
+        asset_count = counts['asset_count']
+        hubspot_count = counts['hubspot_count']
+        empty_titles = counts['empty_titles']
         
         # Calculate percentages
         non_content_count = image_count + asset_count
@@ -191,146 +330,163 @@ class CSVProcessor:
     
     def filter_content_pages(self, df: pd.DataFrame) -> pd.DataFrame:
         """Filter out non-content pages like images, CSS, JS files"""
+        filtered_df = df[self._content_mask(df)]
         
-        # Define file extensions to exclude
-        non_content_extensions = [
-            '.jpg', '.jpeg', '.png', '.gif', '.webp', '.svg', '.ico',
-            '.css', '.js', '.json', '.xml', '.pdf', 
-            '.woff', '.woff2', '.ttf', '.eot',
-            '.mp4', '.mp3', '.avi', '.mov',
-            '.zip', '.tar', '.gz'
-        ]
+        logger.info(f"Filtered out {len(df) - len(filtered_df)} non-content pages")
         
-        # Create pattern for exclusion
-        pattern = '|'.join([f'{ext}' for ext in non_content_extensions])
+        return filtered_df
+    
+    def _content_mask(self, df: pd.DataFrame) -> pd.Series:
+        """Rows of df that look like content pages (NaN-safe, so usable before fillna)"""
+        address = df['Address'].fillna('')
+        title = df['Title 1'].fillna('')
         
         # Filter out URLs ending with these extensions or having query params with these extensions
-        mask = ~df['Address'].str.lower().str.contains(pattern, regex=True, na=False)
-        
-        # Also filter out HubSpot system URLs
-        hubspot_pattern = r'/(hs-fs|hub_generated|_hcms|hs)/'
-        mask = mask & ~df['Address'].str.contains(hubspot_pattern, regex=True, na=False)
-        
-        # Filter out common CMS junk pages
-        cms_junk_patterns = [
-            r'/tag/',
-            r'/category/', 
-            r'/author/',
-            r'/page/\d+',  # Pagination
-            r'/\d{4}/\d{2}/',  # Date archives like /2024/05/
-            r'/feed/',
-            r'/wp-',  # WordPress system pages
-            r'/hs-',  # HubSpot system pages
-        ]
-        
-        # Apply CMS filters
-        for pattern in cms_junk_patterns:
-            mask = mask & ~df['Address'].str.contains(pattern, regex=True, na=False)
+        mask = ~address.str.contains(_NON_CONTENT_RE, na=False)
         
-        filtered_df = df[mask].copy()
+        # Also filter out HubSpot system URLs and common CMS junk pages
+        mask = mask & ~address.str.contains(_JUNK_URL_RE, na=False)
         
         # Also filter out pages with empty titles (likely non-content)
-        filtered_df = filtered_df[
-            (filtered_df['Title 1'].notna()) & 
-            (filtered_df['Title 1'].str.strip() != '')
-        ]
+        mask = mask & (title.str.strip() != '')
         
         # Filter out blog tag/archive pages by title pattern
-        blog_archive_patterns = [
-            # Pattern for "X Blog | Y" where Y is a tag/category/author
-            r'Blog\s*\|\s*(Admin|Dr\.|Awards|Tags?|Categories?|Archives?|Health|News|Media|Hernia|Melanoma|Pain)',
-            # Pattern for generic blog archive pages
-            r'^\s*[^|]+Blog\s*$',  # Just "Something Blog" with no real content
-            # Pattern for tag pages that might not have /tag/ in URL
-            r'\|\s*Latest news for',  # Common WordPress archive page pattern
-        ]
-        
-        for pattern in blog_archive_patterns:
-            filtered_df = filtered_df[~filtered_df['Title 1'].str.contains(pattern, regex=True, na=False)]
-        
-        logger.info(f"Filtered out {len(df) - len(filtered_df)} non-content pages")
+        mask = mask & ~title.str.contains(_BLOG_ARCHIVE_RE, na=False)
         
-        return filtered_df
+        return mask
     
-    def filter_indexable_pages(self) -> pd.DataFrame:
-        """Filter to only indexable, 200-status pages"""
-        if self.df is None:
+    def filter_indexable_pages(self, df: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+        """Filter to only indexable, 200-status pages (of self.df by default)"""
+        if df is None:
+            df = self.df
+        if df is None:
             raise ValueError("DataFrame not loaded")
         
         # Apply filters
-        filtered = self.df[
-            (self.df['Status Code'] == 200) &
-            (self.df['Indexability'] == 'Indexable')
-        ].copy()
+        filtered = df[self._indexable_mask(df)]
         
         # Fill NaN values
-        filtered = filtered.fillna("")
+        filtered = self._fill_missing(filtered)
+        
+        logger.info(f"Filtered from {len(df)} to {len(filtered)} indexable pages")
+        
+        return filtered
+    
+    def _indexable_mask(self, df: pd.DataFrame) -> pd.Series:
+        """Rows of df that are indexable, 200-status pages"""
+        return (df['Status Code'] == 200) & (df['Indexability'] == 'Indexable')
+    
+    def _fill_missing(self, df: pd.DataFrame) -> pd.DataFrame:
+        """fillna("") on df, with categorical columns turned back into plain text first"""
+        categories = {col: object for col in self.CATEGORY_COLUMNS if col in df.columns}
+        return df.astype(categories).fillna("")
+    
+    def filter_pages(self, df: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+        """filter_indexable_pages + filter_content_pages in one pass (of self.df by default)
+        
+        Both masks are built on the raw frame and combined, so the rows are
+        selected and NaN-filled once instead of copying the frame per step.
+        """
+        if df is None:
+            df = self.df
+        if df is None:
+            raise ValueError("DataFrame not loaded")
+        
+        indexable = self._indexable_mask(df)
+        mask = indexable & self._content_mask(df)
+        
+        filtered = self._fill_missing(df[mask])
         
-        logger.info(f"Filtered from {len(self.df)} to {len(filtered)} indexable pages")
+        indexable_count = int(indexable.sum())
+        logger.info(f"Filtered from {len(df)} to {indexable_count} indexable pages")
+        logger.info(f"Filtered out {indexable_count - len(filtered)} non-content pages")
         
         return filtered
     
-    def improve_descriptions(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Improve empty or duplicate descriptions"""
+    def improve_descriptions(self, df: pd.DataFrame,
+                             url_lower: Optional[pd.Series] = None) -> pd.DataFrame:
+        """Improve empty or duplicate descriptions
+        
+        url_lower is the lower-cased Address column, if the caller has it.
+        """
         df = df.copy()
         
-        for idx, row in df.iterrows():
-            url = row['Address'].lower()
-            title = row['Title 1']
-            description = row['Meta Description 1']
+        url = url_lower if url_lower is not None else df['Address'].str.lower()
+        title = df['Title 1']
+        title_lower = title.str.lower()
+        description = df['Meta Description 1']
+        
+        # Fix empty descriptions or descriptions that just repeat the title
+        needs_fix = (description == '') | (description == title)
+        
+        # Rules are checked in order - the first match supplies the description
+        lymph_node = url.str.contains('/lymph-node-procedures/', regex=False)
+        cyst_removal = title_lower.str.contains('cyst removal', regex=False)
+        skin_cancer = title_lower.str.contains('skin cancer', regex=False)
+        
+        # Location pages with just city names - extract city name from title
+        city = (
+            title.str.replace('General & Breast Surgery in', '', regex=False)
+                 .str.replace('| PSN', '', regex=False)
+                 .str.strip()
+        )
+        
+        rules = [
+            # Lymph node procedures
+            (lymph_node & title_lower.str.contains('excisional', regex=False),
+             "Surgical removal of entire lymph node for comprehensive cancer diagnosis and staging"),
+            (lymph_node & title_lower.str.contains('sentinel', regex=False),
+             "Minimally invasive lymph node biopsy to detect cancer spread with reduced complications"),
+            (lymph_node,
+             "Advanced lymph node diagnostic procedure for accurate cancer detection and treatment planning"),
+            
+            # Location pages with just city names
+            (url.str.contains('/locations/', regex=False) & (title.str.len() < 50),
+             "Expert breast and general surgery services available at our " + city + " location with compassionate care"),
+            
+            # Generic cyst removal pages
+            (cyst_removal & url.str.contains('cholecystectomy', regex=False),
+             "Gallbladder removal surgery for gallstones and cholecystitis with minimally invasive options available"),
+            (cyst_removal & url.str.contains('skin', regex=False),
+             "Safe removal of skin cysts including sebaceous, epidermoid, and pilar cysts with minimal scarring"),
+            (cyst_removal,
+             "Expert surgical cyst removal procedures with focus on complete excision and cosmetic results"),
+            
+            # Skin cancer pages
+            (skin_cancer & url.str.contains('melanoma', regex=False),
+             "Specialized melanoma treatment including wide excision surgery and sentinel node biopsy"),
+            (skin_cancer & url.str.contains('basal', regex=False),
+             "Effective basal cell carcinoma removal with Mohs surgery and reconstruction options"),
+            (skin_cancer & url.str.contains('squamous', regex=False),
+             "Comprehensive squamous cell carcinoma treatment with surgical excision and margin analysis"),
+            (skin_cancer,
+             "Advanced surgical treatment for all skin cancer types with focus on complete removal"),
             
-            # Fix empty descriptions or descriptions that just repeat the title
-            if not description or description == title:
-                # Lymph node procedures
-                if '/lymph-node-procedures/' in url:
-                    if 'excisional' in title.lower():
-                        description = "Surgical removal of entire lymph node for comprehensive cancer diagnosis and staging"
-                    elif 'sentinel' in title.lower():
-                        description = "Minimally invasive lymph node biopsy to detect cancer spread with reduced complications"
-                    else:
-                        description = "Advanced lymph node diagnostic procedure for accurate cancer detection and treatment planning"
-                
-                # Location pages with just city names
-                elif '/locations/' in url and len(title) < 50:
-                    # Extract city name from title
-                    city = title.replace('General & Breast Surgery in', '').replace('| PSN', '').strip()
-                    description = f"Expert breast and general surgery services available at our {city} location with compassionate care"
-                
-                # Generic cyst removal pages
-                elif 'cyst removal' in title.lower():
-                    if 'cholecystectomy' in url:
-                        description = "Gallbladder removal surgery for gallstones and cholecystitis with minimally invasive options available"
-                    elif 'skin' in url:
-                        description = "Safe removal of skin cysts including sebaceous, epidermoid, and pilar cysts with minimal scarring"
-                    else:
-                        description = "Expert surgical cyst removal procedures with focus on complete excision and cosmetic results"
-                
-                # Skin cancer pages
-                elif 'skin cancer' in title.lower():
-                    if 'melanoma' in url:
-                        description = "Specialized melanoma treatment including wide excision surgery and sentinel node biopsy"
-                    elif 'basal' in url:
-                        description = "Effective basal cell carcinoma removal with Mohs surgery and reconstruction options"
-                    elif 'squamous' in url:
-                        description = "Comprehensive squamous cell carcinoma treatment with surgical excision and margin analysis"
-                    else:
-                        description = "Advanced surgical treatment for all skin cancer types with focus on complete removal"
-                
-                # Homepage
-                elif url.endswith('.com/') or url.endswith('.com'):
-                    description = "Leading surgical practice specializing in breast cancer, hernia repair, and minimally invasive procedures"
-                
-                # Generic medical pages
-                elif any(term in title.lower() for term in ['surgery', 'procedure', 'treatment']):
-                    description = f"{title} with experienced surgeons providing personalized care and optimal outcomes"
-                
-                # Update the description
-                df.at[idx, 'Meta Description 1'] = description
+            # Homepage
+            (url.str.endswith(('.com/', '.com')),
+             "Leading surgical practice specializing in breast cancer, hernia repair, and minimally invasive procedures"),
+            
+            # Generic medical pages
+            (title_lower.str.contains('surgery|procedure|treatment'),
+             title + " with experienced surgeons providing personalized care and optimal outcomes"),
+        ]
+        
+        # Update the descriptions in one vectorized pass
+        df['Meta Description 1'] = np.select(
+            [needs_fix & condition for condition, _ in rules],
+            [value for _, value in rules],
+            default=description
+        )
         
         return df
     
-    def deduplicate_urls(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Remove duplicate URLs and duplicate titles, keeping best version"""
+    def deduplicate_urls(self, df: pd.DataFrame,
+                         url_lower: Optional[pd.Series] = None) -> pd.DataFrame:
+        """Remove duplicate URLs and duplicate titles, keeping best version
+        
+        url_lower is the lower-cased Address column (indexed like df), if
+        the caller has it.
+        """
         # First, normalize URLs (remove trailing slashes)
         df['normalized_url'] = df['Address'].str.rstrip('/').str.strip()
         
@@ -339,57 +495,53 @@ class CSVProcessor:
         logger.info(f"After URL deduplication: {len(df)} pages")
         
         # Handle title duplicates more intelligently
-        title_duplicates = df[df.duplicated(subset=['Title 1'], keep=False)].copy()
+        title_duplicates = df[df.duplicated(subset=['Title 1'], keep=False)]
         
         if len(title_duplicates) > 0:
-            # Group by title
-            title_groups = title_duplicates.groupby('Title 1')
+            if url_lower is None:
+                url_lower = title_duplicates['Address'].str.lower()
+            url = url_lower.loc[title_duplicates.index]
+            title_lower = title_duplicates['Title 1'].str.lower()
+            
+            # Score every duplicate at once to keep the best page per title:
+            # 1. Prefer service pages over location pages
+            # 2. Prefer pages with longer, more specific URLs
+            # 3. Prefer pages with meta descriptions
+            priority = np.select(
+                [
+                    # Service pages get highest priority
+                    url.str.contains('/services/', regex=False),
+                    # Gastrointestinal is likely miscategorized
+                    url.str.contains('/gastrointestinal-procedures', regex=False)
+                    & title_lower.str.contains('skin', regex=False),
+                    # Location pages with wrong titles get lowest priority
+                    url.str.contains('/locations', regex=False)
+                    & title_lower.str.contains('cyst removal', regex=False),
+                    # Prefer specific procedure URLs
+                    url.str.contains('/procedures/|/treatments/'),
+                ],
+                [10, -10, -20, 8],
+                default=0
+            ).astype(float)
+            
+            # Add points for having a description
+            priority += 2 * (title_duplicates['Meta Description 1'] != '').to_numpy()
+            
+            # Add points for URL specificity (more segments = more specific)
+            priority += 0.5 * url.str.count(r'[^/]+').to_numpy()
             
-            indices_to_drop = []
+            # Keep the highest priority page - the first one on ties. Only the
+            # title column is reordered; the frame itself is never copied
+            order = np.argsort(-priority, kind='stable')
+            best_titles = title_duplicates['Title 1'].iloc[order].drop_duplicates(keep='first')
             
-            for title, group in title_groups:
-                if len(group) > 1:
-                    # Sort by criteria to keep the best page:
-                    # 1. Prefer service pages over location pages
-                    # 2. Prefer pages with longer, more specific URLs
-                    # 3. Prefer pages with meta descriptions
-                    
-                    group['priority'] = 0
-                    
-                    # Scoring system
-                    for idx, row in group.iterrows():
-                        url = row['Address'].lower()
-                        
-                        # Service pages get highest priority
-                        if '/services/' in url:
-                            group.at[idx, 'priority'] = 10
-                        # Gastrointestinal is likely miscategorized
-                        elif '/gastrointestinal-procedures' in url and 'skin' in title.lower():
-                            group.at[idx, 'priority'] = -10
-                        # Location pages with wrong titles get lowest priority
-                        elif '/locations' in url and 'cyst removal' in title.lower():
-                            group.at[idx, 'priority'] = -20
-                        # Prefer specific procedure URLs
-                        elif any(term in url for term in ['/procedures/', '/treatments/']):
-                            group.at[idx, 'priority'] = 8
-                        
-                        # Add points for having a description
-                        if row['Meta Description 1']:
-                            group.at[idx, 'priority'] += 2
-                        
-                        # Add points for URL specificity (more segments = more specific)
-                        url_depth = len([s for s in url.split('/') if s])
-                        group.at[idx, 'priority'] += url_depth * 0.5
-                    
-                    # Keep the highest priority page
-                    best_idx = group['priority'].idxmax()
-                    drop_indices = [idx for idx in group.index if idx != best_idx]
-                    indices_to_drop.extend(drop_indices)
-                    
-                    logger.info(f"Duplicate '{title}': keeping {group.loc[best_idx, 'Address']}")
+            best_addresses = title_duplicates['Address'].loc[best_titles.index]
+            for title, address in zip(best_titles, best_addresses):
+                logger.info(f"Duplicate '{title}': keeping {address}")
             
             # Drop the duplicates
-            if indices_to_drop:
+            indices_to_drop = title_duplicates.index.difference(best_titles.index)
+            if len(indices_to_drop):
                 df = df.drop(indices_to_drop)
                 logger.info(f"Removed {len(indices_to_drop)} duplicate titles")
         
@@ -399,11 +551,14 @@ class CSVProcessor:
     
     def extract_site_metadata(self, df: pd.DataFrame) -> Dict[str, str]:
         """Extract site-level metadata from homepage"""
-        # Look for homepage
-        homepage_candidates = df[df['Address'].str.match(r'^https?://[^/]+/?$')]
-        
-        if not homepage_candidates.empty:
-            homepage = homepage_candidates.iloc[0]
+        # Look for homepage - stop at the first match instead of scanning every URL
+        homepage_position = next(
+            (i for i, address in enumerate(df['Address']) if _HOMEPAGE_RE.match(address)),
+            None
+        )
+        
+        if homepage_position is not None:
+            homepage = df.iloc[homepage_position]
         else:
             # Fallback to first row
             homepage = df.iloc[0]
@@ -414,6 +569,16 @@ class CSVProcessor:
             'site_url': homepage.get('Address', '').strip()
         }
     
+    @staticmethod
+    def _to_records(df: pd.DataFrame) -> List[Dict]:
+        """Same result as df.to_dict('records'), built from whole columns
+        
+        Column.tolist() converts each column to Python objects in one pass,
+        instead of pandas boxing every cell row by row.
+        """
+        columns = list(df.columns)
+        return [dict(zip(columns, row)) for row in zip(*(df[col].tolist() for col in columns))]
+    
     def process(self) -> Dict:
         """Main processing pipeline"""
         # Validate file
@@ -421,43 +586,48 @@ class CSVProcessor:
         if not valid:
             raise ValueError(error)
         
-        # Load CSV
-        self.load_csv()
-        
-        # Validate columns
-        valid, missing = self.validate_columns()
-        if not valid:
-            raise ValueError(f"Missing required columns: {', '.join(missing)}")
-        
-        # Get column info for logging
-        col_info = self.get_column_info()
-        logger.info(f"CSV loaded with {col_info['total_columns']} columns")
-        
-        # Analyze quality before filtering
-        quality_analysis = self.analyze_csv_quality(self.df)
-        
-        # Filter and clean
-        filtered_df = self.filter_indexable_pages()
+        if self.file_size_mb > self.CHUNKED_PROCESSING_MIN_MB:
+            filtered_df, total_rows, indexable_pages, col_info, quality_analysis = self._filter_chunked()
+        else:
+            # Load CSV
+            self.load_csv()
+            total_rows = len(self.df)
+            
+            # Validate columns
+            valid, missing = self.validate_columns()
+            if not valid:
+                raise ValueError(f"Missing required columns: {', '.join(missing)}")
+            
+            # Get column info for logging
+            col_info = self.get_column_info()
+            logger.info(f"CSV loaded with {col_info['total_columns']} columns")
+            
+            # Analyze quality before filtering
+            quality_analysis = self.analyze_csv_quality(self.df)
+            
+            # Filter to indexable content pages
+            filtered_df = self.filter_pages()
+            indexable_pages = len(filtered_df)
         
-        # Additional content filtering
-        filtered_df = self.filter_content_pages(filtered_df)
+        # Lower-case URLs once for both cleanup steps
+        url_lower = filtered_df['Address'].str.lower()
         
         # Improve descriptions before deduplication
-        filtered_df = self.improve_descriptions(filtered_df)
+        filtered_df = self.improve_descriptions(filtered_df, url_lower)
         
         # Remove duplicates (both URL and title based)
-        deduped_df = self.deduplicate_urls(filtered_df)
+        deduped_df = self.deduplicate_urls(filtered_df, url_lower)
         
         # Extract metadata
         site_metadata = self.extract_site_metadata(deduped_df)
         
         # Prepare processed data
         self.processed_data = {
-            'pages': deduped_df.to_dict('records'),
+            'pages': self._to_records(deduped_df),
             'site_metadata': site_metadata,
             'stats': {
-                'total_rows': len(self.df),
-                'indexable_pages': len(filtered_df),
+                'total_rows': total_rows,
+                'indexable_pages': indexable_pages,
                 'unique_pages': len(deduped_df),
                 'column_info': col_info,
                 'quality_analysis': quality_analysis
@@ -466,6 +636,85 @@ class CSVProcessor:
         
         return self.processed_data
     
+    def _filter_chunked(self) -> Tuple[pd.DataFrame, int, int, Dict, Dict]:
+        """Load, analyze and filter a large CSV CHUNK_SIZE rows at a time
+        
+        Only pages that survive the indexability and content filters are
+        kept, and only the first of each normalized URL across all chunks.
+        self.df holds just the header afterwards.
+        
+        Returns:
+            (filtered pages, total row count, indexable page count,
+             column info, quality analysis)
+        """
+        try:
+            return self._filter_chunks('utf-8')
+        except UnicodeDecodeError:
+            # Try with different encoding
+            return self._filter_chunks('latin-1')
+    
+    def _filter_chunks(self, encoding: str) -> Tuple[pd.DataFrame, int, int, Dict, Dict]:
+        """_filter_chunked with a given file encoding"""
+        # Validate columns against the header alone
+        with self._read_errors():
+            read_options = self._read_options(encoding)
+            self.df = pd.read_csv(self.csv_path, nrows=0, encoding=encoding, **read_options)
+        valid, missing = self.validate_columns()
+        if not valid:
+            raise ValueError(f"Missing required columns: {', '.join(missing)}")
+        
+        col_info = self.get_column_info()
+        logger.info(f"CSV has {col_info['total_columns']} columns, processing in chunks of {self.CHUNK_SIZE}")
+        
+        quality_counts = {}
+        indexable_pages = 0
+        seen_urls = set()
+        survivors = []
+        
+        for chunk in self._read_chunks(encoding, read_options):
+            for key, count in self._count_quality(chunk).items():
+                quality_counts[key] = quality_counts.get(key, 0) + count
+            
+            filtered = self.filter_pages(chunk)
+            indexable_pages += len(filtered)
+            
+            # Drop URL duplicates as they stream in, normalized as in deduplicate_urls
+            normalized_url = filtered['Address'].str.rstrip('/').str.strip()
+            first_seen = np.fromiter(
+                (url not in seen_urls and not seen_urls.add(url) for url in normalized_url),
+                dtype=bool,
+                count=len(normalized_url)
+            )
+            survivors.append(filtered[first_seen])
+        
+        if not survivors:
+            raise ValueError("CSV file is empty")
+        
+        quality_analysis = self._summarize_quality(quality_counts)
+        return pd.concat(survivors), quality_counts['total_rows'], indexable_pages, col_info, quality_analysis
+    
+    def _read_chunks(self, encoding: str, read_options: Dict) -> Iterator[pd.DataFrame]:
+        """Yield the CSV CHUNK_SIZE rows at a time, read errors raised as in load_csv"""
+        with self._read_errors():
+            with pd.read_csv(self.csv_path, chunksize=self.CHUNK_SIZE, encoding=encoding,
+                             low_memory=False, **read_options) as reader:
+                yield from reader
+    
+    @contextmanager
+    def _read_errors(self):
+        """Raise pandas/pyarrow read errors as the ValueErrors load_csv gives
+        
+        UnicodeDecodeError passes through, so callers can retry as latin-1.
+        """
+        try:
+            yield
+        except UnicodeDecodeError:
+            raise
+        except pd.errors.EmptyDataError:
+            raise ValueError("CSV file is empty")
+        except Exception as e:
+            raise ValueError(f"Error reading CSV: {str(e)}")
+    
     def get_sample_data(self, n: int = 5) -> List[Dict]:
         """Get sample of processed pages for preview"""
         if not self.processed_data:
@@ -4,14 +4,17 @@ Post-process LLMS.txt to enhance descriptions with GPT
 Keeps your accurate categorization, just improves descriptions
 """
 import json
-import re
-from openai import OpenAI
+import asyncio
+from openai import AsyncOpenAI
 from pathlib import Path
 import os
 from dotenv import load_dotenv
 
 load_dotenv()
 
+# Maximum number of GPT batches in flight at once
+MAX_CONCURRENT_BATCHES = 8
+
 def enhance_descriptions(json_path: str, sections_to_enhance: list = None):
     """
     Enhance descriptions for specific sections using GPT-3.5
@@ -25,103 +28,110 @@ def enhance_descriptions(json_path: str, sections_to_enhance: list = None):
     with open(json_path, 'r') as f:
         data = json.load(f)
     
-    client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-    
     # Default to enhancing high-value sections
     if sections_to_enhance is None:
         sections_to_enhance = ["Services", "Providers"]
     
     enhanced_data = data.copy()
     
+    # Process in small batches of 10 pages
+    jobs = []
     for section_name in sections_to_enhance:
         if section_name not in data['sections']:
             continue
             
         pages = data['sections'][section_name]
-        
-        # Process in small batches of 10 pages
         for i in range(0, len(pages), 10):
-            batch = pages[i:i+10]
-            
-            # Simple prompt focused ONLY on descriptions
-            prompt = f"""
+            jobs.append((section_name, i, pages[i:i+10]))
+    
+    results = asyncio.run(_enhance_batches(jobs))
+    
+    # Update descriptions
+    for (section_name, i, batch), descriptions in zip(jobs, results):
+        for j, page in enumerate(batch):
+            if page['url'] in descriptions:
+                enhanced_data['sections'][section_name][i+j]['description'] = descriptions[page['url']]
+    
+    return enhanced_data
+
+async def _enhance_batches(jobs: list) -> list:
+    """Send all batches concurrently, MAX_CONCURRENT_BATCHES at a time"""
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_BATCHES)
+    
+    async with AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY")) as client:
+        async def run(section_name: str, batch: list) -> dict:
+            async with semaphore:
+                return await _enhance_batch(client, section_name, batch)
+        
+        return await asyncio.gather(*(run(section_name, batch) for section_name, _, batch in jobs))
+
+async def _enhance_batch(client: AsyncOpenAI, section_name: str, batch: list) -> dict:
+    """Enhanced descriptions for one batch keyed by URL, or {} if GPT fails"""
+    
+    # Simple prompt focused ONLY on descriptions
+    prompt = f"""
 Write compelling descriptions for AI search engines (ChatGPT, Claude, Perplexity) for these {section_name} pages.
 Each description should be 15-20 words, highlighting the key benefit or solution.
 
 
 Pages:
 """
-            for page in batch:
-                prompt += f"\nURL: {page['url']}\nTitle: {page['title']}\n"
-            
-            prompt += """
-Return JSON array with url and enhanced description only:
-[{"url": "...", "description": "..."}, ...]
+    for page in batch:
+        prompt += f"\nURL: {page['url']}\nTitle: {page['title']}\n"
+    
+    prompt += """
+Return a JSON object with the url and enhanced description only:
+{"items": [{"url": "...", "description": "..."}, ...]}
 """
-            
-            try:
-                response = client.chat.completions.create(
-                    model="gpt-3.5-turbo",
-                    messages=[{"role": "user", "content": prompt}],
-                    temperature=0.7,
-                    max_tokens=500
-                )
-                
-                content = response.choices[0].message.content
-                # Extract JSON
-                json_match = re.search(r'\[.*\]', content, re.DOTALL)
-                if json_match:
-                    enhancements = json.loads(json_match.group())
-                    
-                    # Update descriptions
-                    for enhancement in enhancements:
-                        for j, page in enumerate(batch):
-                            if page['url'] == enhancement['url']:
-                                enhanced_data['sections'][section_name][i+j]['description'] = enhancement['description']
-                                break
-                
-                print(f"Enhanced {len(batch)} {section_name} descriptions")
-                
-            except Exception as e:
-                print(f"Error enhancing batch: {e}")
-                # Keep original descriptions on error
     
-    return enhanced_data
+    try:
+        response = await client.chat.completions.create(
+            model="gpt-3.5-turbo",
+            messages=[{"role": "user", "content": prompt}],
+            temperature=0.7,
+            max_tokens=500,
+            response_format={"type": "json_object"}
+        )
+        
+        # JSON mode guarantees the whole reply parses
+        content = response.choices[0].message.content
+        enhancements = json.loads(content)["items"]
+        
+        print(f"Enhanced {len(batch)} {section_name} descriptions")
+        return {e['url']: e['description'] for e in enhancements}
+        
+    except Exception as e:
+        print(f"Error enhancing batch: {e}")
+        # Keep original descriptions on error
+        return {}
 
 def regenerate_txt_from_json(enhanced_data: dict, output_path: str):
-    """Regenerate LLMS.txt from enhanced JSON data"""
-    lines = []
-    
-    # Header
+    """Regenerate LLMS.txt from enhanced JSON data, writing it line by line"""
     metadata = enhanced_data['metadata']
-    lines.append(f"# {metadata['site_title']}")
-    lines.append("")
-    lines.append(f"> {metadata['site_summary']}")
-    lines.append("")
-    
-    # Sections
-    for section, pages in enhanced_data['sections'].items():
-        if not pages:
-            continue
-            
-        lines.append(f"## {section}")
-        lines.append("")
+    
+    with open(output_path, 'w', buffering=1 << 20) as f:
+        # Header
+        f.write(f"# {metadata['site_title']}\n")
+        f.write("\n")
+        f.write(f"> {metadata['site_summary']}\n")
         
-        for page in pages:
-            url = page['url']
-            title = page['title']
-            description = page.get('description', '')
+        # Sections - each opens with the blank line that closes the one before
+        for section, pages in enhanced_data['sections'].items():
+            if not pages:
+                continue
+                
+            f.write(f"\n## {section}\n")
+            f.write("\n")
             
-            if description:
-                lines.append(f"- [{title}]({url}): {description}")
-            else:
-                lines.append(f"- [{title}]({url})")
-        
-        lines.append("")
-    
-    # Save
-    with open(output_path, 'w') as f:
-        f.write('\n'.join(lines))
+            for page in pages:
+                url = page['url']
+                title = page['title']
+                description = page.get('description', '')
+                
+                if description:
+                    f.write(f"- [{title}]({url}): {description}\n")
+                else:
+                    f.write(f"- [{title}]({url})\n")
     
     print(f"Enhanced LLMS.txt saved to: {output_path}")
 
@@ -0,0 +1,55 @@
+# backend/json_cache.py
+"""
+Persistent key -> JSON cache for GPT results
+"""
+import json
+import os
+import sqlite3
+from contextlib import closing
+from typing import Any, Dict, Iterable
+
+
+class JSONCache:
+    """SQLite-backed store of JSON values by string key, one table per kind of result"""
+    
+    def __init__(self, path: str, table: str):
+        self.path = path
+        self.table = table
+        
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        
+        with closing(sqlite3.connect(self.path)) as conn, conn:
+            conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {self.table} (key TEXT PRIMARY KEY, value TEXT NOT NULL)"
+            )
+    
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+        """Return the cached values for the keys that have one"""
+        keys = list(keys)
+        found = {}
+        
+        with closing(sqlite3.connect(self.path)) as conn:
+            # Stay well under SQLite's bound-parameter limit
+            for i in range(0, len(keys), 500):
+                chunk = keys[i:i+500]
+                placeholders = ",".join("?" * len(chunk))
+                rows = conn.execute(
+                    f"SELECT key, value FROM {self.table} WHERE key IN ({placeholders})", chunk
+                )
+                for key, value in rows:
+                    found[key] = json.loads(value)
+        
+        return found
+    
+    def set_many(self, entries: Dict[str, Any]):
+        """Store JSON-serializable values by key"""
+        if not entries:
+            return
+        
+        with closing(sqlite3.connect(self.path)) as conn, conn:
+            conn.executemany(
+                f"INSERT OR REPLACE INTO {self.table} (key, value) VALUES (?, ?)",
+                [(key, json.dumps(value)) for key, value in entries.items()]
+            )
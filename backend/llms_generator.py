@@ -7,11 +7,45 @@ import os
 import json
 import logging
 import re
-from typing import Dict, List, Optional
+import time
+import functools
+from typing import Dict, Iterator, List, Optional, Tuple
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
+# A markdown link list item: - [title](url)
+_LINK_RE = re.compile(r'^- \[([^\]]+)\]\(([^)]+)\)')
+
+# Lines validate_output looks for, matched in the whole document
+_H1_RE = re.compile(r'^# ', re.MULTILINE)
+_H2_RE = re.compile(r'^## ', re.MULTILINE)
+# A line that starts with a link item once leading whitespace is stripped
+_LINK_LINE_RE = re.compile(r'^[^\S\n]*- \[.*$', re.MULTILINE)
+
+# Title terms that order pages within a category, searched in lower-cased titles
+_SERVICE_MAIN_RE = re.compile(r'breast reconstruction|breast surgery|cosmetic surgery')
+_SERVICE_PROCEDURE_RE = re.compile(r'diep|tram|implant')
+_BEFORE_AFTER_FLAP_RE = re.compile(r'diep|flap')
+_BLOG_ACHIEVEMENT_RE = re.compile(r'milestone|achievement|record|years of')
+_BLOG_NEWS_RE = re.compile(r'news|announcement|featured')
+
+
+@functools.lru_cache(maxsize=1)
+def _date_for_quarter_hour(quarter_hour: int) -> str:
+    """The local date during one 15-minute slot since the epoch
+    
+    Every UTC offset is a whole number of quarter hours, so local midnight
+    always falls on a slot boundary and the date is fixed within a slot.
+    """
+    return datetime.now().strftime('%Y-%m-%d')
+
+
+def _today_str() -> str:
+    """Today's date as YYYY-MM-DD, formatted once per quarter hour"""
+    return _date_for_quarter_hour(int(time.time() // 900))
+
+
 class LLMSGenerator:
     """Generate LLMS.txt files from categorized data"""
     
@@ -36,149 +70,133 @@ class LLMSGenerator:
                          categorized_pages: Dict[str, List[Dict]],
                          include_stats: bool = True) -> str:
         """Generate the LLMS.txt markdown content optimized for healthcare"""
-        lines = []
-        
-        # Header
-        lines.append(f"# {site_metadata.get('site_title', 'Website')}")
-        lines.append("")
+        return ''.join(self._iter_markdown(site_metadata, categorized_pages, include_stats))
+    
+    def _iter_markdown(self,
+                       site_metadata: Dict,
+                       categorized_pages: Dict[str, List[Dict]],
+                       include_stats: bool) -> Iterator[str]:
+        """Yield the markdown for generate_markdown piece by piece"""
+        # Header - every block after it starts with the blank line that ends the one before
+        yield f"# {site_metadata.get('site_title', 'Website')}\n"
         
         # Site summary
         if site_metadata.get('site_summary'):
-            lines.append(f"> {site_metadata['site_summary']}")
-            lines.append("")
+            yield f"\n> {site_metadata['site_summary']}\n"
         
         # Optional metadata comment
         if include_stats:
-            lines.append(f"<!-- Generated on {datetime.now().strftime('%Y-%m-%d')} -->")
+            yield f"\n<!-- Generated on {_today_str()} -->\n"
             total_pages = sum(len(pages) for pages in categorized_pages.values())
-            lines.append(f"<!-- Total pages: {total_pages} -->")
-            lines.append("")
+            yield f"<!-- Total pages: {total_pages} -->\n"
+        
+        for category, sorted_pages in self._sorted_sections(categorized_pages):
+            yield f"\n## {category}\n\n"
+            
+            for page in sorted_pages:
+                url = page.get('url', '')
+                title = page.get('title', 'Untitled')
+                description = page.get('description', '')
+                
+                # Format the line
+                if description:
+                    yield f"- [{title}]({url}): {description}\n"
+                else:
+                    yield f"- [{title}]({url})\n"
+    
+    def _sorted_sections(self, categorized_pages: Dict[str, List[Dict]]) -> Iterator[Tuple[str, List[Dict]]]:
+        """Yield (category, sorted pages) for each non-empty category, in output order"""
+        # Only categories with pages get a section
+        remaining = {category: pages for category, pages in categorized_pages.items() if pages}
         
         # Categories and pages - Use healthcare-optimized order
         for category in self.CATEGORY_ORDER:
-            if category in categorized_pages and categorized_pages[category]:
-                pages = categorized_pages[category]
-                
-                lines.append(f"## {category}")
-                lines.append("")
-                
+            pages = remaining.pop(category, None)
+            if pages is not None:
                 # Sort pages by title for consistency, but prioritize important ones
-                sorted_pages = self._sort_pages_for_category(category, pages)
-                
-                for page in sorted_pages:
-                    url = page.get('url', '')
-                    title = page.get('title', 'Untitled')
-                    description = page.get('description', '')
-                    
-                    # Format the line
-                    if description:
-                        lines.append(f"- [{title}]({url}): {description}")
-                    else:
-                        lines.append(f"- [{title}]({url})")
-                
-                lines.append("")  # Empty line after each section
-        
-        # Then add any categories not in CATEGORY_ORDER (like "Other")
-        for category, pages in categorized_pages.items():
-            if category not in self.CATEGORY_ORDER and pages:
-                lines.append(f"## {category}")
-                lines.append("")
-                
-                sorted_pages = sorted(pages, key=lambda x: x.get('title', ''))
-                
-                for page in sorted_pages:
-                    url = page.get('url', '')
-                    title = page.get('title', 'Untitled')
-                    description = page.get('description', '')
-                    
-                    if description:
-                        lines.append(f"- [{title}]({url}): {description}")
-                    else:
-                        lines.append(f"- [{title}]({url})")
-                
-                lines.append("")
+                yield category, self._sort_pages_for_category(category, pages)
         
-        return '\n'.join(lines)
+        # Then add any categories not in CATEGORY_ORDER (like "Other") - all that is left
+        for category, pages in remaining.items():
+            yield category, sorted(pages, key=lambda x: x.get('title', ''))
     
     def _sort_pages_for_category(self, category: str, pages: List[Dict]) -> List[Dict]:
-        """Sort pages within each category for optimal presentation"""
+        """Sort pages within each category for optimal presentation
+        
+        Priority functions take the lower-cased title, computed once per page
+        along with the rest of its sort key.
+        """
         
         if category == "Services":
             # Put main services first, then specific procedures
-            def service_priority(page):
-                title = page.get('title', '').lower()
-                if any(term in title for term in ['breast reconstruction', 'breast surgery', 'cosmetic surgery']):
+            def priority(title):
+                if _SERVICE_MAIN_RE.search(title):
                     return 0  # Main services first
-                elif any(term in title for term in ['diep', 'tram', 'implant']):
+                elif _SERVICE_PROCEDURE_RE.search(title):
                     return 1  # Specific procedures second
                 else:
                     return 2  # Everything else
-            
-            return sorted(pages, key=lambda x: (service_priority(x), x.get('title', '')))
         
         elif category == "Before & After":
             # Group by procedure type
-            def before_after_priority(page):
-                title = page.get('title', '').lower()
+            def priority(title):
                 if 'breast reconstruction' in title:
                     return 0
                 elif 'breast' in title:
                     return 1
-                elif any(term in title for term in ['diep', 'flap']):
+                elif _BEFORE_AFTER_FLAP_RE.search(title):
                     return 2
                 else:
                     return 3
-            
-            return sorted(pages, key=lambda x: (before_after_priority(x), x.get('title', '')))
         
         elif category == "Blog":
             # Put recent achievements and milestones first
-            def blog_priority(page):
-                title = page.get('title', '').lower()
-                if any(term in title for term in ['milestone', 'achievement', 'record', 'years of']):
+            def priority(title):
+                if _BLOG_ACHIEVEMENT_RE.search(title):
                     return 0  # Achievements first
-                elif any(term in title for term in ['news', 'announcement', 'featured']):
+                elif _BLOG_NEWS_RE.search(title):
                     return 1  # News second
                 else:
                     return 2  # Regular blog content
-            
-            return sorted(pages, key=lambda x: (blog_priority(x), x.get('title', '')))
         
         else:
             # Default alphabetical sort for other categories
             return sorted(pages, key=lambda x: x.get('title', ''))
+        
+        def sort_key(page):
+            title = page.get('title', '')
+            return priority(title.lower()), title
+        
+        return sorted(pages, key=sort_key)
     
     def validate_output(self, content: str) -> List[str]:
         """Validate the generated LLMS.txt content with healthcare-specific checks"""
         issues = []
-        lines = content.split('\n')
         
         # Check for required elements
-        if not any(line.startswith('# ') for line in lines):
+        if not _H1_RE.search(content):
             issues.append("Missing H1 header (site title)")
         
-        if not any(line.startswith('## ') for line in lines):
+        if not _H2_RE.search(content):
             issues.append("No sections found (H2 headers)")
         
-        # Check for malformed links - improved regex
+        # Check for malformed links - scanned in place rather than split into lines
         link_count = 0
-        link_pattern = re.compile(r'^- \[([^\]]+)\]\(([^)]+)\)')
         
-        for line in lines:
-            if line.strip().startswith('- ['):
-                link_count += 1
-                # Check if it's a valid markdown link format
-                if not link_pattern.match(line.strip()):
-                    # Only flag as malformed if it truly doesn't match the pattern
-                    if '](' not in line:
-                        issues.append(f"Malformed link (missing ']('): {line[:50]}...")
+        for link_line in _LINK_LINE_RE.finditer(content):
+            line = link_line.group()
+            link_count += 1
+            # Check if it's a valid markdown link format
+            if not _LINK_RE.match(line.strip()):
+                # Only flag as malformed if it truly doesn't match the pattern
+                if '](' not in line:
+                    issues.append(f"Malformed link (missing ']('): {line[:50]}...")
         
         if link_count == 0:
             issues.append("No links found in output")
         
         # Healthcare-specific validations
-        services_found = any('## Services' in line for line in lines)
-        if not services_found:
+        if '## Services' not in content:
             issues.append("No Services section found - critical for healthcare sites")
         
         # Check for reasonable length
@@ -219,16 +237,27 @@ class LLMSGenerator:
                site_metadata: Dict,
                categorized_pages: Dict[str, List[Dict]],
                max_lines: int = 50) -> str:
-        """Generate a preview of the LLMS.txt content"""
-        full_content = self.generate_markdown(site_metadata, categorized_pages, include_stats=False)
-        lines = full_content.split('\n')
+        """Generate a preview of the LLMS.txt content
+        
+        Only the first max_lines lines are kept - the rest of the document is
+        just counted for the truncation indicator.
+        """
+        kept = []
+        newlines = 0
+        for piece in self._iter_markdown(site_metadata, categorized_pages, include_stats=False):
+            if newlines < max_lines:
+                kept.append(piece)
+            newlines += piece.count('\n')
+        
+        content = ''.join(kept)
+        total_lines = newlines + 1
         
-        if len(lines) <= max_lines:
-            return full_content
+        if total_lines <= max_lines:
+            return content
         
         # Truncate and add indicator
-        preview_lines = lines[:max_lines]
+        preview_lines = content.split('\n')[:max_lines]
         preview_lines.append("...")
-        preview_lines.append(f"[{len(lines) - max_lines} more lines]")
+        preview_lines.append(f"[{total_lines - max_lines} more lines]")
         
         return '\n'.join(preview_lines)
\ No newline at end of file
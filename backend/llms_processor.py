@@ -22,13 +22,18 @@ class LLMSProcessor:
     
     def __init__(self, 
                  output_dir: str = "exports",
-                 api_key: Optional[str] = None):
+                 api_key: Optional[str] = None,
+                 use_batch_api: bool = False,
+                 use_cache: bool = True):
         self.output_dir = output_dir
         self.api_key = api_key
         
         # Initialize components - AI enhancement is now mandatory
         self.csv_processor = None
-        self.categorizer = Categorizer(use_gpt=True, api_key=api_key)  # Always use GPT
+        # use_cache=False re-enhances every page and writes no .llms_cache/
+        self.categorizer = Categorizer(use_gpt=True, api_key=api_key,  # Always use GPT
+                                       use_batch_api=use_batch_api,
+                                       cache_path=Categorizer.ENHANCEMENT_CACHE_PATH if use_cache else None)
         self.generator = LLMSGenerator(output_dir=output_dir)
         
         # Store results for access
@@ -144,7 +149,7 @@ class LLMSProcessor:
                 return {
                     'valid': False,
                     'error': f"Missing columns: {', '.join(missing)}",
-                    'available_columns': list(processor.df.columns)
+                    'available_columns': processor.columns
                 }
             
             # Get quality analysis
@@ -158,7 +163,7 @@ class LLMSProcessor:
                 'valid': True,
                 'total_rows': len(processor.df),
                 'columns': col_info,
-                'file_size_mb': Path(csv_path).stat().st_size / (1024 * 1024),
+                'file_size_mb': processor.file_size_mb,
                 'analysis': analysis,
                 'export_advice': export_advice
             }
@@ -1,48 +1,143 @@
 import json
-import tiktoken
-from openai import OpenAI
+import asyncio
+import functools
+import hashlib
+from openai import AsyncOpenAI
 from dotenv import load_dotenv
 import os
 
+try:
+    # Optional faster JSON parser for GPT responses
+    import orjson
+except ImportError:
+    orjson = None
+
 load_dotenv()
 
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+# Chat model for grouping - also the default tokenizer for num_tokens_from_messages
+GPT_MODEL = "gpt-4o-mini"
+
+# Loading an encoding parses its BPE ranks - do it once per model
+@functools.lru_cache(maxsize=None)
+def _encoding_for_model(model):
+    import tiktoken
+    return tiktoken.encoding_for_model(model)
 
-def num_tokens_from_messages(messages, model="gpt-3.5-turbo"):
-    encoding = tiktoken.encoding_for_model(model)
+def num_tokens_from_messages(messages, model=GPT_MODEL):
+    encoding = _encoding_for_model(model)
     tokens_per_message = 3
     tokens_per_name = 1
     num_tokens = 0
+    values = []
     for message in messages:
         num_tokens += tokens_per_message
         for key, value in message.items():
-            num_tokens += len(encoding.encode(value))
+            values.append(value)
             if key == "name":
                 num_tokens += tokens_per_name
+    # Tokenize every value in one call, across tiktoken's worker threads
+    num_tokens += sum(len(tokens) for tokens in encoding.encode_batch(values, num_threads=os.cpu_count() or 1))
     num_tokens += 3
     return num_tokens
 
-def build_llms_with_gpt(pages: list, site_name: str, summary: str, chunk_size: int = 60):
+# Maximum number of GPT chunk requests in flight at once
+MAX_CONCURRENT_CHUNKS = 8
+
+# Where grouped chunks are kept between runs, keyed by model and prompt
+GPT_CACHE_PATH = os.path.join(".llms_cache", "gpt_chunks.sqlite")
+
+def build_llms_with_gpt(pages: list, site_name: str, summary: str, chunk_size: int = 60,
+                        use_cache: bool = True):
     if not pages:
         return {"success": False, "error": "No pages to process."}
 
     all_chunks = [pages[i:i + chunk_size] for i in range(0, len(pages), chunk_size)]
-    print(f"Sending {len(all_chunks)} GPT batches...")
-
+    prompts = [_chunk_prompt(chunk) for chunk in all_chunks]
+
+    # Chunks grouped on an earlier run are reused instead of re-sent
+    cache = None
+    if use_cache:
+        # Importing backend pulls in pandas and openai's sync client - only pay for it here
+        from backend.json_cache import JSONCache
+        cache = JSONCache(GPT_CACHE_PATH, table="gpt_chunks")
+    keys = [_cache_key(prompt) for prompt in prompts]
+    results = cache.get_many(keys) if cache else {}
+    misses = [i for i, key in enumerate(keys) if key not in results]
+    if len(misses) < len(all_chunks):
+        print(f"Reusing {len(all_chunks) - len(misses)} cached GPT batches...")
+    print(f"Sending {len(misses)} GPT batches...")
+
+    sent = asyncio.run(_send_prompts([prompts[i] for i in misses])) if misses else []
+    for i, result in zip(misses, sent):
+        results[keys[i]] = result
+
+    if cache:
+        cache.set_many({keys[i]: result for i, result in zip(misses, sent) if _is_grouping(result)})
+
+    results = [results[key] for key in keys]
+
+    # Merge in chunk order, so sections list pages as the sequential loop did
     section_data = {}
 
-    for i, chunk in enumerate(all_chunks):
-        print(f"Processing chunk {i + 1} of {len(all_chunks)}...")
-        simplified = [
-            {
-                "title": p.get("Title", ""),
-                "url": p.get("Address", ""),
-                "meta": p.get("Meta Description", "")
-            }
-            for p in chunk
-        ]
-
-        prompt = f"""
+    for result in results:
+        if isinstance(result, Exception):
+            return {"success": False, "error": str(result)}
+
+        try:
+            for section, pages in result.items():
+                if section not in section_data:
+                    section_data[section] = []
+                section_data[section].extend(pages)
+
+        except Exception as e:
+            return {"success": False, "error": str(e)}
+
+    return {
+        "success": True,
+        "site_title": site_name,
+        "site_summary": summary,
+        "sections": section_data
+    }
+
+# A reply that merges cleanly - section names mapped to lists of page dicts.
+# Only these are cached, so a malformed reply is re-sent rather than replayed.
+def _is_grouping(result) -> bool:
+    return isinstance(result, dict) and all(
+        isinstance(pages, list) and all(isinstance(page, dict) for page in pages)
+        for pages in result.values()
+    )
+
+def _cache_key(prompt: str) -> str:
+    return hashlib.sha1(f"{GPT_MODEL}|{prompt}".encode("utf-8")).hexdigest()
+
+# Sends every prompt concurrently, MAX_CONCURRENT_CHUNKS at a time. Results come
+# back in prompt order, with a failed chunk's exception in its place.
+async def _send_prompts(prompts: list) -> list:
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_CHUNKS)
+
+    # One client per run - its connection pool is tied to this event loop
+    async with AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY")) as client:
+        async def send(i, prompt):
+            async with semaphore:
+                print(f"Processing chunk {i + 1} of {len(prompts)}...")
+                return await _group_chunk(client, prompt)
+
+        return await asyncio.gather(
+            *(send(i, prompt) for i, prompt in enumerate(prompts)),
+            return_exceptions=True
+        )
+
+def _chunk_prompt(chunk: list) -> str:
+    simplified = [
+        {
+            "title": p.get("Title", ""),
+            "url": p.get("Address", ""),
+            "meta": p.get("Meta Description", "")
+        }
+        for p in chunk
+    ]
+
+    return f"""
 You are helping organize web pages for AI search.
 
 Group the following pages into sections. Use these standard ones when applicable:
@@ -62,26 +157,13 @@ Input:
 {json.dumps(simplified)}
 """
 
-        try:
-            response = client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[{"role": "user", "content": prompt}]
-            )
-
-            content = response.choices[0].message.content
-            gpt_sections = json.loads(content)
-
-            for section, pages in gpt_sections.items():
-                if section not in section_data:
-                    section_data[section] = []
-                section_data[section].extend(pages)
-
-        except Exception as e:
-            return {"success": False, "error": str(e)}
+async def _group_chunk(client: AsyncOpenAI, prompt: str) -> dict:
+    # JSON mode - the reply always parses, so a chunk can't fail on malformed output
+    response = await client.chat.completions.create(
+        model=GPT_MODEL,
+        messages=[{"role": "user", "content": prompt}],
+        response_format={"type": "json_object"}
+    )
 
-    return {
-        "success": True,
-        "site_title": site_name,
-        "site_summary": summary,
-        "sections": section_data
-    }
+    content = response.choices[0].message.content
+    return orjson.loads(content) if orjson is not None else json.loads(content)
@@ -1,9 +1,26 @@
 import pandas as pd
 import os
 import json
+import ahocorasick
+
+try:
+    # Optional - multi-threaded CSV parsing
+    import pyarrow
+except ImportError:
+    pyarrow = None
+
+try:
+    # Optional faster JSON writer for LLMS.json
+    import orjson
+except ImportError:
+    orjson = None
 
 EXPORTS_DIR = "exports"
 
+# The only columns run_tool reads - the rest of the export is never parsed
+CSV_TEXT_COLUMNS = ["Address", "Title 1", "Meta Description 1", "Indexability"]
+CSV_COLUMNS = CSV_TEXT_COLUMNS + ["Status Code"]
+
 SECTION_PATTERNS = {
     "Services": ["services", "therapy", "injection", "prp", "bmac", "treatment", "decompression"],
     "Areas Treated": ["areas-we-treat", "pain", "sciatica", "shoulder", "hip", "back", "neck"],
@@ -14,19 +31,40 @@ SECTION_PATTERNS = {
     "About Us": ["about", "mission", "careers", "values"]
 }
 
-
-def normalize_url(url):
-    return url.rstrip("/").strip()
-
-def deduplicate_pages(pages):
-    seen = set()
-    deduped = []
-    for page in pages:
-        url = normalize_url(page.get("Address", ""))
-        if url not in seen:
-            seen.add(url)
-            deduped.append(page)
-    return deduped
+# Every pattern in one automaton, valued with its section's position in
+# SECTION_PATTERNS - the earliest section with a match wins
+SECTION_NAMES = list(SECTION_PATTERNS)
+SECTION_AUTOMATON = ahocorasick.Automaton()
+for section_index, patterns in enumerate(SECTION_PATTERNS.values()):
+    for pattern in patterns:
+        # A pattern listed under two sections belongs to the first
+        if pattern not in SECTION_AUTOMATON:
+            SECTION_AUTOMATON.add_word(pattern, section_index)
+SECTION_AUTOMATON.make_automaton()
+
+
+def read_pages_csv(csv_path):
+    header = pd.read_csv(csv_path, nrows=0).columns
+    usecols = [col for col in CSV_COLUMNS if col in header]
+    text_columns = [col for col in CSV_TEXT_COLUMNS if col in header]
+
+    if pyarrow is not None:
+        try:
+            # Arrow strings keep nulls as nulls - dtype=str would turn them into 'None'
+            df = pd.read_csv(
+                csv_path,
+                engine="pyarrow",
+                usecols=usecols,
+                dtype={col: "string[pyarrow]" for col in text_columns}
+            )
+        except (pyarrow.ArrowInvalid, pd.errors.ParserError):
+            pass
+        else:
+            for col in text_columns:
+                df[col] = df[col].to_numpy(dtype=object, na_value=float("nan"))
+            return df
+
+    return pd.read_csv(csv_path, usecols=usecols, dtype={col: str for col in text_columns})
 
 def parse_site_metadata(df):
     homepage = df.iloc[0]
@@ -35,13 +73,20 @@ def parse_site_metadata(df):
     return site_title.strip(), site_summary.strip()
 
 def classify_section(url, title):
-    url_lower = url.lower()
-    title_lower = title.lower()
-    for section, patterns in SECTION_PATTERNS.items():
-        for pattern in patterns:
-            if pattern in url_lower or pattern in title_lower:
-                return section
-    return "Other"
+    # One pass over URL and title - the newline keeps a pattern from spanning both
+    text = url.lower() + "\n" + title.lower()
+    section_index = min((index for _, index in SECTION_AUTOMATON.iter(text)), default=None)
+    if section_index is None:
+        return "Other"
+    return SECTION_NAMES[section_index]
+
+def classify_sections(urls, titles):
+    # classify_section over the columns - one automaton pass per row keeps
+    # pace with Arrow's regex kernels, so there is a single matcher to maintain
+    return pd.Series(
+        [classify_section(url, title) for url, title in zip(urls, titles)],
+        index=urls.index
+    )
 
 def run_tool(input_data: dict) -> dict:
     csv_path = input_data.get("csv_path")
@@ -49,29 +94,30 @@ def run_tool(input_data: dict) -> dict:
     if not csv_path or not os.path.exists(csv_path):
         return {"success": False, "error": "CSV path is missing or invalid."}
 
-    df = pd.read_csv(csv_path)
+    df = read_pages_csv(csv_path)
     df = df[df["Status Code"] == 200]
     df = df[df["Indexability"] == "Indexable"]
     df = df.fillna("")
 
     site_title, site_summary = parse_site_metadata(df)
-    pages = deduplicate_pages(df.to_dict(orient="records"))
-
-    grouped = {}
-    seen_urls = set()
-    for page in pages:
-        url = normalize_url(page.get("Address", ""))
-        if url in seen_urls:
-            continue
-        seen_urls.add(url)
-        title = page.get("Title 1", "Untitled").strip()
-        desc = page.get("Meta Description 1", "").strip()
-        section = classify_section(url, title)
-        grouped.setdefault(section, []).append({
-            "url": url,
-            "title": title,
-            "description": desc
-        })
+
+    # Keep the first row of each normalized URL
+    urls = df["Address"].str.rstrip("/").str.strip()
+    first = ~urls.duplicated()
+    df, urls = df[first], urls[first]
+
+    pages = pd.DataFrame({
+        "url": urls,
+        "title": df["Title 1"].str.strip() if "Title 1" in df else "Untitled",
+        "description": df["Meta Description 1"].str.strip() if "Meta Description 1" in df else ""
+    })
+    pages["section"] = classify_sections(pages["url"], pages["title"])
+
+    # Sections in order of their first page, as the row loop built them
+    grouped = {
+        section: section_pages[["url", "title", "description"]].to_dict(orient="records")
+        for section, section_pages in pages.groupby("section", sort=False)
+    }
 
     txt_lines = [f"# {site_title}", "", site_summary, ""]
     for section, section_pages in grouped.items():
@@ -87,13 +133,17 @@ def run_tool(input_data: dict) -> dict:
     with open(txt_path, "w") as f:
         f.write("\n".join(txt_lines))
 
-    with open(json_path, "w") as f:
-        json.dump(grouped, f, indent=2)
+    if orjson is not None:
+        with open(json_path, "wb") as f:
+            f.write(orjson.dumps(grouped, option=orjson.OPT_INDENT_2))
+    else:
+        with open(json_path, "w") as f:
+            json.dump(grouped, f, indent=2)
 
     return {
         "success": True,
         "file": txt_path,
         "json": json_path,
         "section_count": len(grouped),
-        "total_pages": len(seen_urls)
+        "total_pages": len(pages)
     }
@@ -1,14 +1,13 @@
 # run.py
 import argparse
 import sys
+from operator import itemgetter
 from pathlib import Path
 from dotenv import load_dotenv
 
 # Add backend to path if needed
 sys.path.insert(0, str(Path(__file__).parent))
 
-from backend import LLMSProcessor
-
 # Load environment variables
 load_dotenv()
 
@@ -34,6 +33,8 @@ Examples:
   python run.py data/crawl.csv --preview
   python run.py data/crawl.csv --output mysite_llms
   python run.py data/crawl.csv --force
+  python run.py data/crawl.csv --batch-api
+  python run.py data/crawl.csv --no-cache
         '''
     )
     
@@ -68,6 +69,18 @@ Examples:
         help="Process even if CSV quality is poor"
     )
     
+    parser.add_argument(
+        "--batch-api",
+        action="store_true",
+        help="Enhance via the OpenAI Batch API (half the cost, results can take up to 24h)"
+    )
+    
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Re-enhance every page instead of reusing enhancements cached in .llms_cache/"
+    )
+    
     args = parser.parse_args()
     
     # Check if file exists
@@ -75,8 +88,11 @@ Examples:
         print(f"❌ Error: File not found: {args.csv_path}")
         sys.exit(1)
     
+    # Imported here so --help and bad paths don't wait on pandas/openai
+    from backend import LLMSProcessor
+    
     # Initialize processor with mandatory AI enhancement
-    processor = LLMSProcessor()
+    processor = LLMSProcessor(use_batch_api=args.batch_api, use_cache=not args.no_cache)
     
     # Validate CSV quality
     print(f"Analyzing {args.csv_path}...")
@@ -151,7 +167,7 @@ Examples:
         # Show categories
         print(f"\n📁 Categories:")
         total_categorized = 0
-        for category, count in sorted(result['categories'].items(), key=lambda x: x[1], reverse=True):
+        for category, count in sorted(result['categories'].items(), key=itemgetter(1), reverse=True):
             if count > 0:
                 print(f"  {category}: {count} pages")
                 total_categorized += count
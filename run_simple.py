@@ -2,45 +2,53 @@
 
 import argparse
 import sys
+from operator import itemgetter
 from pathlib import Path
-from dotenv import load_dotenv
 
 sys.path.insert(0, str(Path(__file__).parent))
 
-from backend import LLMSProcessor
-
-load_dotenv()
+def csv_path_arg(path: str) -> str:
+    """argparse type for the CSV argument - rejects paths that aren't files"""
+    if not Path(path).is_file():
+        raise argparse.ArgumentTypeError(f"File not found: {path}")
+    # Kept as a str - CSVProcessor checks the extension with str methods
+    return path
 
 def main():
     parser = argparse.ArgumentParser(
         description="LLMS File Builder - Convert Screaming Frog exports to LLMS.txt files"
     )
     
-    parser.add_argument("csv_path", help="Path to Screaming Frog CSV export")
+    parser.add_argument("csv_path", type=csv_path_arg, help="Path to Screaming Frog CSV export")
+    # Kept so existing invocations still parse - GPT enhancement always runs
     parser.add_argument(
         "--use-gpt", 
         action="store_true", 
-        help="Enhance descriptions with GPT for better AI search value"
+        help=argparse.SUPPRESS
     )
     parser.add_argument("--output", type=str, help="Custom output filename")
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Re-enhance every page instead of reusing cached enhancements"
+    )
     
     args = parser.parse_args()
     
-    # Check if file exists
-    if not Path(args.csv_path).exists():
-        print(f"❌ Error: File not found: {args.csv_path}")
-        sys.exit(1)
+    # Imported here so --help and bad paths don't wait on pandas/openai
+    from dotenv import load_dotenv
+    from backend import LLMSProcessor
+    
+    # The API key is always needed - GPT enhancement is mandatory
+    load_dotenv()
     
     # Process
     print(f"Processing {args.csv_path}...")
     
-    processor = LLMSProcessor(use_gpt=args.use_gpt)
+    processor = LLMSProcessor(use_cache=not args.no_cache)
     
-    if args.use_gpt:
-        print("📋 Using pattern-based categorization (accurate)")
-        print("✨ Enhancing descriptions with GPT for AI search...")
-    else:
-        print("⚡ Using pattern-based categorization...")
+    print("📋 Using pattern-based categorization (accurate)")
+    print("✨ Enhancing descriptions with GPT for AI search...")
     
     # Process the file
     result = processor.process_file(
@@ -55,7 +63,7 @@ def main():
         if 'categories' in result:
             print("\n📁 Categories:")
             for cat, count in sorted(result['categories'].items(), 
-                                    key=lambda x: x[1], reverse=True):
+                                    key=itemgetter(1), reverse=True):
                 if count > 0:
                     print(f"  {cat}: {count} pages")
         
@@ -63,10 +71,8 @@ def main():
         if 'files' in result:
             print(f"\n📄 Files saved:")
             print(f"  {result['files']['txt_path']}")
-            print(f"  {result['files']['json_path']}")
-            
-        if args.use_gpt:
-            print("\n✨ Key sections enhanced with AI-optimized descriptions")
+        
+        print("\n✨ Key sections enhanced with AI-optimized descriptions")
     else:
         print(f"\n❌ Error: {result.get('error', 'Unknown error')}")
 
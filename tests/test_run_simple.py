@@ -0,0 +1,67 @@
+"""
+Smoke test for the run_simple.py CLI on the bundled sample export
+"""
+import io
+import json
+import os
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from pathlib import Path
+from types import SimpleNamespace
+from unittest import mock
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+import run_simple
+import backend.categorizer
+
+
+class FakeAsyncOpenAI:
+    """Stands in for AsyncOpenAI - answers every enhancement batch with one entry"""
+    
+    def __init__(self, **kwargs):
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, *exc_info):
+        return False
+    
+    async def _create(self, **kwargs):
+        content = json.dumps([{"index": 1, "title": "", "description": "Enhanced description"}])
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+
+class RunSimpleTest(unittest.TestCase):
+    
+    def test_processes_sample_csv(self):
+        csv_path = str(REPO_ROOT / "internal_html_psc.csv")
+        
+        with tempfile.TemporaryDirectory() as workdir, \
+                mock.patch.object(backend.categorizer, "AsyncOpenAI", FakeAsyncOpenAI), \
+                mock.patch.dict(os.environ, {"OPENAI_API_KEY": "sk-test"}), \
+                mock.patch.object(sys, "argv", ["run_simple.py", csv_path, "--no-cache", "--output", "smoke"]):
+            cwd = os.getcwd()
+            os.chdir(workdir)
+            try:
+                stdout = io.StringIO()
+                with redirect_stdout(stdout):
+                    run_simple.main()
+            finally:
+                os.chdir(cwd)
+            
+            output = stdout.getvalue()
+            self.assertIn("✅ Success!", output)
+            
+            txt_path = Path(workdir, "exports", "smoke.txt")
+            self.assertTrue(txt_path.is_file())
+            self.assertIn("Enhanced description", txt_path.read_text(encoding="utf-8"))
+            self.assertFalse(Path(workdir, ".llms_cache").exists())
+
+
+if __name__ == "__main__":
+    unittest.main()